@@ -3,12 +3,18 @@ from flask import Flask
 from flask_cors import CORS
 from flask_session import Session
 from redis import Redis
+from werkzeug.middleware.proxy_fix import ProxyFix
 from .config import config
 from app.models.database import init_app as init_db_app
+from app.utils.json_provider import FastJSONProvider
+from app.utils.rate_limit import init_rate_limiter
+from app.utils.storage import storage
 
 def create_app(config_name='default'):
     app = Flask(__name__, instance_relative_config=True)
     app.config.from_object(config[config_name])
+    app.json = FastJSONProvider(app)
+    app.logger.info(f"Using {app.json.backend} for JSON serialization")
     
     os.makedirs(app.instance_path, exist_ok=True)
     
@@ -18,7 +24,7 @@ def create_app(config_name='default'):
          resources={r"/*": {"origins": cors_origins}}, 
          supports_credentials=True,
          allow_headers=["Content-Type", "Authorization", "Accept", "X-Requested-With"],
-         expose_headers=["Access-Control-Allow-Origin"],
+         expose_headers=["Access-Control-Allow-Origin", "X-Next-Cursor", "X-Prev-Cursor", "X-Total-Count"],
          methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
          vary_header=True)
     
@@ -32,6 +38,12 @@ def create_app(config_name='default'):
         app.logger.info("UpStash configured for session storage")
     
     Session(app)
+    
+    if app.config['PROXY_FIX_X_FOR']:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
+    
+    init_rate_limiter(app)
+    storage.init_app(app)
         
     @app.after_request
     def add_vary_header(response):
@@ -50,11 +62,6 @@ def create_app(config_name='default'):
     from app.api import register_api_blueprints
     register_api_blueprints(app)
     
-    if app.config['CLOUDINARY_CLOUD_NAME'] and app.config['CLOUDINARY_API_KEY']:
-        app.logger.info("Cloudinary configured for image uploads")
-    else:
-        app.logger.warning("Cloudinary is not configured - image uploads will not work")
-    
     @app.route('/health')
     def health_check():
         return {'status': 'ok'}, 200
@@ -29,4 +29,14 @@ bp.register_blueprint(health_bp, url_prefix='/health')
 bp.register_blueprint(social_bp, url_prefix='/social')
 
 def register_api_blueprints(app):
+    from app.api.events.commands import import_participants_command, registration_worker_command
+    from app.api.uploads.commands import (
+        sync_uploads_command, generate_image_variants_command, storage_outbox_worker_command
+    )
+
     app.register_blueprint(bp)
+    app.cli.add_command(import_participants_command)
+    app.cli.add_command(registration_worker_command)
+    app.cli.add_command(sync_uploads_command)
+    app.cli.add_command(generate_image_variants_command)
+    app.cli.add_command(storage_outbox_worker_command)
@@ -3,6 +3,7 @@ from flask import request, jsonify, session, current_app, make_response
 from functools import wraps
 from . import bp
 from app.models.database import db, AdminCredential
+from app.utils.rate_limit import rate_limit
 from werkzeug.security import check_password_hash, generate_password_hash
 
 def login_required(view):
@@ -14,6 +15,7 @@ def login_required(view):
     return wrapped_view
 
 @bp.route('/login', methods=['POST'])
+@rate_limit('LOGIN')
 def login():
     if not request.is_json:
         return jsonify({"error": "Missing JSON"}), 400
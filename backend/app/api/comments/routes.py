@@ -1,20 +1,76 @@
 import datetime
 from flask import jsonify, request, current_app
+from sqlalchemy import and_, or_
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.database import db, Comment, Page
 from app.api.auth.routes import login_required
+from app.utils.rate_limit import rate_limit
+from app.utils.pagination import encode_cursor, decode_cursor
 from . import bp
 
+MAX_ADMIN_PAGE_SIZE = 200
+DEFAULT_FEED_PAGE_SIZE = 20
+MAX_FEED_PAGE_SIZE = 100
+
 def comments_enabled():
     return True
 
 @bp.route('/post/<int:post_id>', methods=['GET'])
 def get_comments(post_id):
+    limit = request.args.get('limit', type=int)
+    before = request.args.get('before')
+    after = request.args.get('after')
+
+    if before and after:
+        return jsonify({"error": "Use either 'before' or 'after', not both"}), 400
+    if limit is not None and limit < 1:
+        return jsonify({"error": "Limit must be a positive integer"}), 400
+
     try:
-        comments = Comment.query.filter_by(page_id=post_id).order_by(Comment.created_at.desc()).all()
-        
-        result = [comment.to_dict() for comment in comments]
-        return jsonify(result)
+        cursor = decode_cursor(before or after) if (before or after) else None
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+
+    try:
+        query = Comment.query.filter_by(page_id=post_id)
+
+        if limit is None and cursor is None:
+            comments = query.order_by(Comment.created_at.desc(), Comment.id.desc()).all()
+            return jsonify([comment.to_dict() for comment in comments])
+
+        limit = min(limit or DEFAULT_FEED_PAGE_SIZE, MAX_FEED_PAGE_SIZE)
+
+        if after:
+            created_at, comment_id = cursor
+            query = query.filter(or_(
+                Comment.created_at > created_at,
+                and_(Comment.created_at == created_at, Comment.id > comment_id)
+            )).order_by(Comment.created_at.asc(), Comment.id.asc())
+        else:
+            if before:
+                created_at, comment_id = cursor
+                query = query.filter(or_(
+                    Comment.created_at < created_at,
+                    and_(Comment.created_at == created_at, Comment.id < comment_id)
+                ))
+            query = query.order_by(Comment.created_at.desc(), Comment.id.desc())
+
+        comments = query.limit(limit + 1).all()
+        has_more = len(comments) > limit
+        comments = comments[:limit]
+
+        if after:
+            comments.reverse()
+            has_newer, has_older = has_more, True
+        else:
+            has_newer, has_older = bool(before), has_more
+
+        response = jsonify([comment.to_dict() for comment in comments])
+        if comments and has_older:
+            response.headers['X-Next-Cursor'] = encode_cursor(comments[-1].created_at, comments[-1].id)
+        if comments and has_newer:
+            response.headers['X-Prev-Cursor'] = encode_cursor(comments[0].created_at, comments[0].id)
+        return response
     
     except SQLAlchemyError as e:
         current_app.logger.error(f"Database error: {str(e)}")
@@ -24,6 +80,7 @@ def get_comments(post_id):
         return jsonify({"error": "An unexpected error occurred"}), 500
 
 @bp.route('/post/<slug>', methods=['POST'])
+@rate_limit('COMMENT')
 def add_comment(slug):
     if not request.is_json:
         return jsonify({"error": "Missing JSON in request"}), 400
@@ -54,7 +111,7 @@ def add_comment(slug):
         if page.comments_disabled:
             return jsonify({"error": "Comments are disabled for this post"}), 403
         
-        now = datetime.datetime.now().isoformat()
+        now = datetime.datetime.now()
         
         comment = Comment(
             author_name=data['name'],
@@ -81,19 +138,34 @@ def add_comment(slug):
 @bp.route('/admin', methods=['GET'])
 @login_required
 def get_all_comments():
+    post_id = request.args.get('post_id', type=int)
+    limit = request.args.get('limit', type=int)
+    page_number = request.args.get('page', type=int)
+
+    if limit is not None and limit < 1:
+        return jsonify({"error": "Limit must be a positive integer"}), 400
+    if page_number is not None and page_number < 1:
+        return jsonify({"error": "Page must be a positive integer"}), 400
+
     try:
-        comments = Comment.query.order_by(Comment.created_at.desc()).all()
-        
+        query = db.session.query(Comment, Page.title, Page.slug).outerjoin(Page, Comment.page_id == Page.id)
+
+        if post_id is not None:
+            query = query.filter(Comment.page_id == post_id)
+
+        query = query.order_by(Comment.created_at.desc(), Comment.id.desc())
+
+        if limit:
+            limit = min(limit, MAX_ADMIN_PAGE_SIZE)
+            query = query.offset(((page_number or 1) - 1) * limit).limit(limit)
+
         result = []
-        for comment in comments:
+        for comment, post_title, post_slug in query.all():
             comment_dict = comment.to_dict()
-            
-            page = Page.query.get(comment.page_id)
-            comment_dict['post_title'] = page.title if page else 'Unknown'
-            comment_dict['post_slug'] = page.slug if page else ''
-            
+            comment_dict['post_title'] = post_title if post_title is not None else 'Unknown'
+            comment_dict['post_slug'] = post_slug if post_slug is not None else ''
             result.append(comment_dict)
-            
+
         return jsonify(result)
     
     except SQLAlchemyError as e:
@@ -3,9 +3,11 @@ from flask import jsonify, request, current_app
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.database import db, Contact
 from app.api.auth.routes import login_required
+from app.utils.rate_limit import rate_limit
 from . import bp
 
 @bp.route('', methods=['POST'])
+@rate_limit('CONTACT')
 def submit_contact():
     if not request.is_json:
         return jsonify({"error": "Missing JSON in request"}), 400
@@ -0,0 +1,36 @@
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from app.models.database import Event
+from app.utils.participant_utils import iter_import_rows, import_participants
+from app.utils.registration_queue import run_registration_worker
+
+@click.command('import-participants')
+@with_appcontext
+@click.argument('event_id')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--batch-size', type=int, default=None, help='Rows per upsert statement.')
+def import_participants_command(event_id, path, batch_size):
+    if not Event.query.get(event_id):
+        raise click.ClickException(f"Event not found: {event_id}")
+
+    batch_size = batch_size or current_app.config['PARTICIPANT_IMPORT_BATCH_SIZE']
+
+    with open(path, 'rb') as stream:
+        try:
+            rows = iter_import_rows(stream, path)
+            summary = import_participants(event_id, rows, batch_size=batch_size)
+        except ValueError as e:
+            raise click.ClickException(str(e))
+
+    for error in summary['errors']:
+        click.echo(f"Row {error['row']}: {error['error']}", err=True)
+
+    click.echo(f"Imported {summary['imported']} participants, {summary['failed']} failed, {summary['duplicates']} duplicate rows merged.")
+
+@click.command('registration-worker')
+@with_appcontext
+@click.option('--once', is_flag=True, help='Drain the queue and exit instead of waiting for new registrations.')
+def registration_worker_command(once):
+    total = run_registration_worker(once=once)
+    click.echo(f"Persisted {total} queued registrations.")
@@ -1,20 +1,84 @@
-from flask import jsonify, request, current_app, send_file
-from sqlalchemy.exc import SQLAlchemyError
+from flask import jsonify, request, current_app, send_file, url_for, Response, stream_with_context
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from redis.exceptions import RedisError
 from app.models.database import db, Event, Participant
 from app.api.auth.routes import login_required
+from app.utils.rate_limit import rate_limit, registration_key
+from app.utils.participant_utils import (
+    iter_import_rows, import_participants, parse_student_identifier, mark_attendance,
+    parse_export_columns, generate_participants_csv, write_participants_xlsx,
+    validate_participant, register_participant_row, get_registration_settings, invalidate_registration_status,
+    participant_list_query, SORT_FIELDS, MAX_PARTICIPANT_PAGE_SIZE
+)
+from app.utils.registration_queue import enqueue_registration, get_registration_receipt
+from app.utils.event_capacity import (
+    parse_capacity, reserve_seat, reserve_seat_in_db, seats_taken, release_seat, reset_seat_counter,
+    SEAT_FULL, SEAT_RESERVED
+)
+from app.utils.event_cache import (
+    get_cached, set_cached, get_cached_eligibility, cache_eligibility, invalidate_event_cache,
+    ALL_EVENTS, NEGATIVE_RESULT
+)
+from app.utils.event_stats import compute_event_stats, compute_overall_stats, TIMELINE_INTERVALS
+from app.utils.checkin_tokens import (
+    issue_checkin_token, verify_checkin_token, event_checkin_key, checkin_qr_png, TOKEN_VERSION, SIGNATURE_BYTES
+)
 from . import bp
 from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont
 import qrcode
+import base64
 import os
 import datetime
 
+MAX_BULK_ATTENDANCE = 5000
 
 @bp.route('', methods=['GET'])
 def get_events():
+    when = request.args.get('when', 'all')
+    
+    if when not in ('all', 'upcoming', 'past'):
+        return jsonify({"error": "When must be all, upcoming or past"}), 400
+    
+    try:
+        query = Event.query_with_counts()
+        today = datetime.date.today().isoformat()
+        
+        if when == 'upcoming':
+            query = query.filter(Event.event_date >= today).order_by(Event.event_date.asc())
+        elif when == 'past':
+            query = query.filter(Event.event_date < today).order_by(Event.event_date.desc())
+        else:
+            query = query.order_by(Event.event_date.desc())
+        
+        return jsonify([
+            event.to_dict(participant_count, attended_count)
+            for event, participant_count, attended_count in query.all()
+        ])
+        
+    except SQLAlchemyError as e:
+        current_app.logger.error(f"Database error: {str(e)}")
+        return jsonify({"error": "Database error occurred"}), 500
+    except Exception as e:
+        current_app.logger.error(f"Unexpected error: {str(e)}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+@bp.route('/stats', methods=['GET'])
+@login_required
+def get_overall_stats():
+    interval = request.args.get('interval', 'day')
+    
+    if interval not in TIMELINE_INTERVALS:
+        return jsonify({"error": "Interval must be day or hour"}), 400
+    
+    cache_key, cached = get_cached(ALL_EVENTS, f"stats:{interval}")
+    if cached is not None:
+        return current_app.response_class(cached, mimetype='application/json')
+    
     try:
-        events = Event.query.order_by(Event.event_date.desc()).all()
-        return jsonify([event.to_dict() for event in events])
+        response = jsonify(compute_overall_stats(interval))
+        set_cached(cache_key, response.get_data(), current_app.config['EVENT_STATS_CACHE_TTL'])
+        return response
         
     except SQLAlchemyError as e:
         current_app.logger.error(f"Database error: {str(e)}")
@@ -26,12 +90,13 @@ def get_events():
 @bp.route('/<event_id>', methods=['GET'])
 def get_event(event_id):
     try:
-        event = Event.query.get(event_id)
+        row = Event.query_with_counts().filter(Event.id == event_id).first()
         
-        if not event:
+        if not row:
             return jsonify({"error": "Event not found"}), 404
-            
-        return jsonify(event.to_dict())
+        
+        event, participant_count, attended_count = row
+        return jsonify(event.to_dict(participant_count, attended_count))
         
     except SQLAlchemyError as e:
         current_app.logger.error(f"Database error: {str(e)}")
@@ -51,6 +116,11 @@ def create_event():
     if not data or 'name' not in data or 'event_date' not in data:
         return jsonify({"error": "Name and event date are required"}), 400
     
+    try:
+        capacity = parse_capacity(data.get('capacity'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
     try:
         event_id = Event.generate_id(data['name'], data['event_date'])
         
@@ -64,13 +134,17 @@ def create_event():
             description=data.get('description', ''),
             event_date=data['event_date'],
             accepting_submissions=data.get('accepting_submissions', True),
+            surge_mode=bool(data.get('surge_mode', False)),
+            capacity=capacity,
             instructor=data.get('instructor', None)
         )
         
         db.session.add(new_event)
         db.session.commit()
+        invalidate_registration_status(event_id)
+        invalidate_event_cache(event_id)
         
-        return jsonify(new_event.to_dict()), 201
+        return jsonify(new_event.to_dict(participant_count=0)), 201
         
     except SQLAlchemyError as e:
         db.session.rollback()
@@ -91,6 +165,11 @@ def update_event(event_id):
     if not data:
         return jsonify({"error": "No update data provided"}), 400
     
+    try:
+        capacity = parse_capacity(data.get('capacity'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
     try:
         event = Event.query.get(event_id)
         
@@ -105,10 +184,18 @@ def update_event(event_id):
             event.event_date = data['event_date']
         if 'accepting_submissions' in data:
             event.accepting_submissions = data['accepting_submissions']
+        if 'surge_mode' in data:
+            event.surge_mode = bool(data['surge_mode'])
+        if 'capacity' in data:
+            event.capacity = capacity
         if 'instructor' in data:
             event.instructor = data['instructor']
             
         db.session.commit()
+        invalidate_registration_status(event_id)
+        invalidate_event_cache(event_id)
+        if 'capacity' in data:
+            reset_seat_counter(event_id)
         
         return jsonify(event.to_dict())
         
@@ -131,6 +218,9 @@ def delete_event(event_id):
             
         db.session.delete(event)
         db.session.commit()
+        invalidate_registration_status(event_id)
+        invalidate_event_cache(event_id)
+        reset_seat_counter(event_id)
         
         return jsonify({"success": True, "message": "Event deleted successfully"})
         
@@ -143,17 +233,83 @@ def delete_event(event_id):
         return jsonify({"error": "An unexpected error occurred"}), 500
 
 
+@bp.route('/<event_id>/stats', methods=['GET'])
+@login_required
+def get_event_stats(event_id):
+    interval = request.args.get('interval', 'day')
+    
+    if interval not in TIMELINE_INTERVALS:
+        return jsonify({"error": "Interval must be day or hour"}), 400
+    
+    cache_key, cached = get_cached(event_id, f"stats:{interval}")
+    if cached is not None:
+        return current_app.response_class(cached, mimetype='application/json')
+    
+    try:
+        event = Event.query.get(event_id)
+        
+        if not event:
+            return jsonify({"error": "Event not found"}), 404
+        
+        response = jsonify(compute_event_stats(event_id, interval))
+        set_cached(cache_key, response.get_data(), current_app.config['EVENT_STATS_CACHE_TTL'])
+        return response
+        
+    except SQLAlchemyError as e:
+        current_app.logger.error(f"Database error: {str(e)}")
+        return jsonify({"error": "Database error occurred"}), 500
+    except Exception as e:
+        current_app.logger.error(f"Unexpected error: {str(e)}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
 @bp.route('/<event_id>/participants', methods=['GET'])
 @login_required
 def get_participants(event_id):
+    limit = request.args.get('limit', type=int)
+    page_number = request.args.get('page', type=int)
+    sort = request.args.get('sort', 'created_at')
+    order = request.args.get('order', 'asc')
+    attended = request.args.get('attended')
+
+    if limit is not None and limit < 1:
+        return jsonify({"error": "Limit must be a positive integer"}), 400
+    if page_number is not None and page_number < 1:
+        return jsonify({"error": "Page must be a positive integer"}), 400
+    if sort not in SORT_FIELDS:
+        return jsonify({"error": f"Sort must be one of: {', '.join(SORT_FIELDS)}"}), 400
+    if order not in ('asc', 'desc'):
+        return jsonify({"error": "Order must be asc or desc"}), 400
+    if attended is not None:
+        if attended.lower() not in ('true', 'false'):
+            return jsonify({"error": "Attended must be true or false"}), 400
+        attended = attended.lower() == 'true'
+
     try:
         event = Event.query.get(event_id)
         
         if not event:
             return jsonify({"error": "Event not found"}), 404
             
-        participants = Participant.query.filter_by(event_id=event_id).all()
-        return jsonify([participant.to_dict() for participant in participants])
+        query = participant_list_query(
+            event_id,
+            sort=sort,
+            order=order,
+            department=request.args.get('department'),
+            academic_year=request.args.get('academic_year'),
+            attended=attended,
+            search=request.args.get('q')
+        )
+
+        if limit is None and page_number is None:
+            return jsonify([participant.to_dict() for participant in query.all()])
+
+        limit = min(limit or MAX_PARTICIPANT_PAGE_SIZE, MAX_PARTICIPANT_PAGE_SIZE)
+        total = query.order_by(None).count()
+        participants = query.offset(((page_number or 1) - 1) * limit).limit(limit).all()
+
+        response = jsonify([participant.to_dict() for participant in participants])
+        response.headers['X-Total-Count'] = str(total)
+        return response
         
     except SQLAlchemyError as e:
         current_app.logger.error(f"Database error: {str(e)}")
@@ -162,63 +318,199 @@ def get_participants(event_id):
         current_app.logger.error(f"Unexpected error: {str(e)}")
         return jsonify({"error": "An unexpected error occurred"}), 500
 
+@bp.route('/<event_id>/participants/export', methods=['GET'])
+@login_required
+def export_participants(event_id):
+    export_format = request.args.get('format', 'csv').lower()
+    filter_type = request.args.get('filter', 'all')
+
+    if export_format not in ('csv', 'xlsx'):
+        return jsonify({"error": "Format must be csv or xlsx"}), 400
+    if filter_type not in ('all', 'attended', 'absent'):
+        return jsonify({"error": "Filter must be all, attended or absent"}), 400
+
+    try:
+        columns = parse_export_columns(request.args.get('columns'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        event = Event.query.get(event_id)
+
+        if not event:
+            return jsonify({"error": "Event not found"}), 404
+
+        filename = f"{event_id}-participants.{export_format}"
+
+        if export_format == 'xlsx':
+            output = write_participants_xlsx(event_id, columns, filter_type)
+            return send_file(
+                output,
+                as_attachment=True,
+                download_name=filename,
+                mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+            )
+
+        return Response(
+            stream_with_context(generate_participants_csv(event_id, columns, filter_type)),
+            mimetype='text/csv',
+            headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+        )
+
+    except ImportError:
+        return jsonify({"error": "XLSX export is not available on this server"}), 400
+    except SQLAlchemyError as e:
+        current_app.logger.error(f"Database error: {str(e)}")
+        return jsonify({"error": "Database error occurred"}), 500
+    except Exception as e:
+        current_app.logger.error(f"Unexpected error: {str(e)}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
 @bp.route('/<event_id>/participants', methods=['POST'])
+@rate_limit('REGISTRATION', key_func=registration_key)
 def register_participant(event_id):
     if not request.is_json:
         return jsonify({"error": "Missing JSON in request"}), 400
         
-    data = request.get_json()
-    
-    required_fields = ['name', 'email', 'department', 'academic_year', 'college_code', 'student_id']
-    for field in required_fields:
-        if field not in data or not data[field]:
-            return jsonify({"error": f"{field.replace('_', ' ').title()} is required"}), 400
+    data = request.get_json() or {}
     
-    email = data['email']
-    if '@' not in email or '.' not in email:
-        return jsonify({"error": "Invalid email format"}), 400
+    participant, error = validate_participant(data)
+    if error:
+        return jsonify({"error": error}), 400
     
+    seat = None
+    registered = False
     try:
-        event = Event.query.get(event_id)
+        settings = get_registration_settings(event_id)
         
-        if not event:
+        if settings is None:
             return jsonify({"error": "Event not found"}), 404
             
-        if not event.accepting_submissions:
+        if not settings['accepting_submissions']:
             return jsonify({"error": "This event is no longer accepting registrations"}), 403
         
-        existing_participant = Participant.query.filter_by(
-            event_id=event_id,
-            student_id=data['student_id']
-        ).first()
+        participant['event_id'] = event_id
+        seat_counted_in_db = False
         
-        if existing_participant:
-            existing_participant.name = data['name']
-            existing_participant.email = data['email']
-            existing_participant.phone = data.get('phone', '')
-            existing_participant.department = data['department']
-            existing_participant.academic_year = data['academic_year']
-            existing_participant.college_code = data['college_code']
-            
-            db.session.commit()
-            return jsonify(existing_participant.to_dict()), 200
-        else:
-            new_participant = Participant(
-                name=data['name'],
-                email=data['email'],
-                phone=data.get('phone', ''),
-                department=data['department'],
-                academic_year=data['academic_year'],
-                college_code=data['college_code'],
-                student_id=data['student_id'],
-                event_id=event_id
-            )
+        if settings['capacity'] is not None:
+            try:
+                seat = reserve_seat(event_id, participant['student_id'], settings['capacity'])
+            except RedisError as e:
+                current_app.logger.warning(f"Seat counter unavailable, checking capacity in the database: {str(e)}")
+                seat = reserve_seat_in_db(event_id, participant['student_id'], settings['capacity'])
+                seat_counted_in_db = True
             
-            db.session.add(new_participant)
-            db.session.commit()
-            
-            return jsonify(new_participant.to_dict()), 201
+            if seat == SEAT_FULL:
+                db.session.rollback()
+                return jsonify({"error": "This event is full"}), 409
+        
+        if settings['surge_mode'] and not seat_counted_in_db:
+            try:
+                receipt_id = enqueue_registration(participant)
+                registered = True
+                return jsonify({"success": True, "status": "queued", "receipt_id": receipt_id}), 202
+            except RedisError as e:
+                current_app.logger.warning(f"Registration queue unavailable, writing directly: {str(e)}")
+        
+        row, created = register_participant_row(participant)
+        db.session.commit()
+        registered = True
+        invalidate_event_cache(event_id)
         
+        return jsonify(Participant(**row).to_dict()), 201 if created else 200
+        
+    except IntegrityError:
+        db.session.rollback()
+        if seat == SEAT_RESERVED:
+            release_seat(event_id, participant['student_id'])
+        invalidate_registration_status(event_id)
+        return jsonify({"error": "Event not found"}), 404
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        if seat == SEAT_RESERVED:
+            release_seat(event_id, participant['student_id'])
+        current_app.logger.error(f"Database error: {str(e)}")
+        return jsonify({"error": "Database error occurred"}), 500
+    except Exception as e:
+        if not registered:
+            db.session.rollback()
+            if seat == SEAT_RESERVED:
+                release_seat(event_id, participant['student_id'])
+        current_app.logger.error(f"Unexpected error: {str(e)}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+@bp.route('/<event_id>/registrations/<receipt_id>', methods=['GET'])
+def get_registration_status(event_id, receipt_id):
+    try:
+        receipt = get_registration_receipt(receipt_id)
+    except RedisError as e:
+        current_app.logger.error(f"Redis error: {str(e)}")
+        return jsonify({"error": "Registration status is temporarily unavailable"}), 503
+    
+    if not receipt or receipt.get('event_id') != event_id:
+        return jsonify({"error": "Registration receipt not found"}), 404
+    
+    return jsonify({"receipt_id": receipt_id, **receipt})
+
+@bp.route('/<event_id>/availability', methods=['GET'])
+def get_event_availability(event_id):
+    try:
+        settings = get_registration_settings(event_id)
+        
+        if settings is None:
+            return jsonify({"error": "Event not found"}), 404
+        
+        capacity = settings['capacity']
+        availability = {
+            "event_id": event_id,
+            "accepting_submissions": settings['accepting_submissions'],
+            "capacity": capacity,
+            "registered": None,
+            "remaining": None
+        }
+        
+        if capacity is not None:
+            try:
+                registered = seats_taken(event_id)
+            except RedisError as e:
+                current_app.logger.warning(f"Seat counter unavailable, counting in the database: {str(e)}")
+                registered = Participant.query.filter_by(event_id=event_id).count()
+            availability.update(registered=registered, remaining=max(capacity - registered, 0))
+        
+        return jsonify(availability)
+        
+    except SQLAlchemyError as e:
+        current_app.logger.error(f"Database error: {str(e)}")
+        return jsonify({"error": "Database error occurred"}), 500
+    except Exception as e:
+        current_app.logger.error(f"Unexpected error: {str(e)}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+@bp.route('/<event_id>/participants/import', methods=['POST'])
+@login_required
+def import_event_participants(event_id):
+    if 'file' not in request.files:
+        return jsonify({"error": "No file provided"}), 400
+
+    file = request.files['file']
+    if file.filename == '':
+        return jsonify({"error": "No file selected"}), 400
+
+    try:
+        event = Event.query.get(event_id)
+
+        if not event:
+            return jsonify({"error": "Event not found"}), 404
+
+        rows = iter_import_rows(file.stream, file.filename)
+        summary = import_participants(event_id, rows, batch_size=current_app.config['PARTICIPANT_IMPORT_BATCH_SIZE'])
+
+        return jsonify(summary)
+
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except ImportError:
+        return jsonify({"error": "XLSX import is not available on this server"}), 400
     except SQLAlchemyError as e:
         db.session.rollback()
         current_app.logger.error(f"Database error: {str(e)}")
@@ -256,12 +548,16 @@ def update_participant(participant_id):
             participant.academic_year = data['academic_year']
         if 'college_code' in data:
             participant.college_code = data['college_code']
+        student_id_changed = 'student_id' in data and data['student_id'] != participant.student_id
         if 'student_id' in data:
             participant.student_id = data['student_id']
         if 'attended' in data:
             participant.attended = data['attended']
             
         db.session.commit()
+        invalidate_event_cache(participant.event_id)
+        if student_id_changed:
+            reset_seat_counter(participant.event_id)
         
         return jsonify(participant.to_dict())
         
@@ -281,9 +577,13 @@ def delete_participant(participant_id):
         
         if not participant:
             return jsonify({"error": "Participant not found"}), 404
-            
+        
+        event_id = participant.event_id
+        student_id = participant.student_id
         db.session.delete(participant)
         db.session.commit()
+        invalidate_event_cache(event_id)
+        release_seat(event_id, student_id)
         
         return jsonify({"success": True, "message": "Participant deleted successfully"})
         
@@ -314,6 +614,7 @@ def update_attendance(participant_id):
             
         participant.attended = data['attended']
         db.session.commit()
+        invalidate_event_cache(participant.event_id)
         
         return jsonify(participant.to_dict())
         
@@ -325,8 +626,178 @@ def update_attendance(participant_id):
         current_app.logger.error(f"Unexpected error: {str(e)}")
         return jsonify({"error": "An unexpected error occurred"}), 500
 
+@bp.route('/<event_id>/attendance', methods=['PUT'])
+@login_required
+def bulk_update_attendance(event_id):
+    if not request.is_json:
+        return jsonify({"error": "Missing JSON in request"}), 400
+
+    data = request.get_json()
+
+    if not data or 'attended' not in data:
+        return jsonify({"error": "No attendance status provided"}), 400
+    if not isinstance(data['attended'], bool):
+        return jsonify({"error": "attended must be true or false"}), 400
+
+    participant_ids = data.get('participant_ids') or []
+    student_identifiers = data.get('students') or []
+
+    if not isinstance(participant_ids, list) or not isinstance(student_identifiers, list):
+        return jsonify({"error": "participant_ids and students must be arrays"}), 400
+    if not participant_ids and not student_identifiers:
+        return jsonify({"error": "No participants provided"}), 400
+    if len(participant_ids) + len(student_identifiers) > MAX_BULK_ATTENDANCE:
+        return jsonify({"error": f"At most {MAX_BULK_ATTENDANCE} participants can be updated at once"}), 400
+
+    try:
+        participant_ids = [int(participant_id) for participant_id in participant_ids]
+        students = [parse_student_identifier(identifier) for identifier in student_identifiers]
+    except (TypeError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+    try:
+        event = Event.query.get(event_id)
+
+        if not event:
+            return jsonify({"error": "Event not found"}), 404
+
+        updated_ids, unknown_ids, unknown_students = mark_attendance(
+            event_id, data['attended'], participant_ids, students
+        )
+        db.session.commit()
+        invalidate_event_cache(event_id)
+
+        return jsonify({
+            "success": True,
+            "attended": data['attended'],
+            "updated": len(updated_ids),
+            "unknown_participant_ids": sorted(unknown_ids),
+            "unknown_students": [f"{college_code}+{student_id}" for college_code, student_id in sorted(unknown_students)]
+        })
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.logger.error(f"Database error: {str(e)}")
+        return jsonify({"error": "Database error occurred"}), 500
+    except Exception as e:
+        current_app.logger.error(f"Unexpected error: {str(e)}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+@bp.route('/<event_id>/checkin/key', methods=['GET'])
+@login_required
+def get_checkin_key(event_id):
+    try:
+        event = Event.query.get(event_id)
+
+        if not event:
+            return jsonify({"error": "Event not found"}), 404
+
+        return jsonify({
+            "event_id": event_id,
+            "version": TOKEN_VERSION,
+            "algorithm": "HMAC-SHA256",
+            "signature_bytes": SIGNATURE_BYTES,
+            "key": base64.b64encode(event_checkin_key(event_id)).decode('ascii')
+        })
+
+    except SQLAlchemyError as e:
+        current_app.logger.error(f"Database error: {str(e)}")
+        return jsonify({"error": "Database error occurred"}), 500
+    except Exception as e:
+        current_app.logger.error(f"Unexpected error: {str(e)}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+@bp.route('/participants/<int:participant_id>/checkin-token', methods=['GET'])
+@login_required
+def get_checkin_token(participant_id):
+    try:
+        participant = Participant.query.get(participant_id)
+
+        if not participant:
+            return jsonify({"error": "Participant not found"}), 404
+
+        token = issue_checkin_token(participant)
+        return jsonify({
+            "token": token,
+            "qr_url": url_for('api.events.get_checkin_qr', token=token, _external=True)
+        })
+
+    except SQLAlchemyError as e:
+        current_app.logger.error(f"Database error: {str(e)}")
+        return jsonify({"error": "Database error occurred"}), 500
+    except Exception as e:
+        current_app.logger.error(f"Unexpected error: {str(e)}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
+@bp.route('/checkin/qr/<token>', methods=['GET'])
+def get_checkin_qr(token):
+    try:
+        verify_checkin_token(token)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    response = send_file(checkin_qr_png(token), mimetype='image/png')
+    response.cache_control.public = True
+    response.cache_control.max_age = 86400
+    return response
+
+@bp.route('/<event_id>/checkin/sync', methods=['POST'])
+@login_required
+def sync_checkins(event_id):
+    if not request.is_json:
+        return jsonify({"error": "Missing JSON in request"}), 400
+
+    data = request.get_json()
+    tokens = data.get('tokens') if isinstance(data, dict) else None
+
+    if not isinstance(tokens, list) or not tokens:
+        return jsonify({"error": "tokens must be a non-empty array"}), 400
+    if len(tokens) > MAX_BULK_ATTENDANCE:
+        return jsonify({"error": f"At most {MAX_BULK_ATTENDANCE} check-ins can be synced at once"}), 400
+
+    students = set()
+    invalid = []
+    for token in tokens:
+        try:
+            claims = verify_checkin_token(token, event_id)
+        except ValueError as e:
+            invalid.append({"token": token, "error": str(e)})
+            continue
+        students.add((claims['college_code'], claims['student_id']))
+
+    try:
+        event = Event.query.get(event_id)
+
+        if not event:
+            return jsonify({"error": "Event not found"}), 404
+
+        updated_ids, _, unknown_students = mark_attendance(event_id, True, students=students)
+        db.session.commit()
+        if updated_ids:
+            invalidate_event_cache(event_id)
+
+        return jsonify({
+            "success": True,
+            "checked_in": len(updated_ids),
+            "invalid": invalid,
+            "unknown_students": [f"{college_code}+{student_id}" for college_code, student_id in sorted(unknown_students)]
+        })
+
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.logger.error(f"Database error: {str(e)}")
+        return jsonify({"error": "Database error occurred"}), 500
+    except Exception as e:
+        current_app.logger.error(f"Unexpected error: {str(e)}")
+        return jsonify({"error": "An unexpected error occurred"}), 500
+
 @bp.route('/<event_id>+<college_code>+<student_id>', methods=['GET'])
 def check_participant_achievement(event_id, college_code, student_id):
+    cache_key, cached = get_cached_eligibility(event_id, college_code, student_id)
+    if cached is not None:
+        status = 404 if cached == NEGATIVE_RESULT else 200
+        return current_app.response_class(cached, status=status, mimetype='application/json')
+    
     try:
         participant = Participant.query.filter_by(
             event_id=event_id,
@@ -334,12 +805,15 @@ def check_participant_achievement(event_id, college_code, student_id):
             student_id=student_id
         ).first()
         if participant and getattr(participant, 'attended', False):
-            return jsonify({
+            response = jsonify({
                 "eligible": True,
                 "participant": participant.to_dict()
             })
         else:
-            return jsonify({"eligible": False}), 404
+            response = current_app.response_class(NEGATIVE_RESULT, status=404, mimetype='application/json')
+        
+        cache_eligibility(cache_key, response.get_data())
+        return response
     except SQLAlchemyError as e:
         current_app.logger.error(f"Database error: {str(e)}")
         return jsonify({"error": "Database error occurred"}), 500
@@ -389,6 +863,13 @@ def send_participant_emails(event_id):
             personalized_message = message.replace("{event_name}", event.name)
             personalized_message = personalized_message.replace("{event_date}", event.event_date)
             personalized_message = personalized_message.replace("{achievement_url}", achievement_url)
+            if "{checkin_token}" in personalized_message or "{checkin_qr}" in personalized_message:
+                checkin_token = issue_checkin_token(p)
+                checkin_qr_url = url_for('api.events.get_checkin_qr', token=checkin_token, _external=True)
+                personalized_message = personalized_message.replace("{checkin_token}", checkin_token)
+                personalized_message = personalized_message.replace(
+                    "{checkin_qr}", f'<img src="{checkin_qr_url}" alt="Check-in QR code" width="240" height="240">'
+                )
             success, _ = send_email([p.email], subject, personalized_message)
             if success:
                 sent_count += 1
@@ -409,6 +890,7 @@ def send_participant_emails(event_id):
         return jsonify({"error": f"An unexpected error occurred: {str(e)}"}), 500
 
 @bp.route('/certificate/download', methods=['POST'])
+@rate_limit('CERTIFICATE')
 def download_certificate():
     import traceback
     data = request.get_json()
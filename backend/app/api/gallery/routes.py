@@ -1,9 +1,16 @@
-from flask import jsonify, request
+import datetime
+from flask import jsonify, request, current_app
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import SQLAlchemyError
 from app.models.database import db, GalleryImage
 from app.api.auth.routes import login_required
-from app.utils.cloudinary_utils import delete_uploaded_file, update_image_metadata
+from app.utils.asset_registry import normalize_public_id
+from app.utils.storage_outbox import enqueue_metadata_update, enqueue_delete, enqueue_metadata_updates, enqueue_deletes
 from . import bp
 
+BULK_OPERATIONS = ['feature', 'unfeature', 'retitle', 'delete']
+MAX_BULK_IMAGES = 1000
+
 @bp.route('/test', methods=['GET'])
 def test_gallery_route():
     return jsonify({'message': 'Gallery API is working'}), 200
@@ -29,7 +36,8 @@ def add_gallery_image():
     if not data or not data.get('url') or not data.get('public_id'):
         return jsonify({'error': 'URL and public_id are required'}), 400
     
-    existing_image = GalleryImage.get_by_public_id(data['public_id'])
+    public_id = normalize_public_id(data['public_id'])
+    existing_image = GalleryImage.get_by_public_id(public_id)
     if existing_image:
         return jsonify({'error': 'Image already exists in the gallery'}), 409
     
@@ -37,15 +45,14 @@ def add_gallery_image():
         title=data.get('title', ''),
         description=data.get('description', ''),
         url=data['url'],
-        public_id=data['public_id'],
+        public_id=public_id,
         featured=data.get('featured', False)
     )
     
     db.session.add(new_image)
-    db.session.commit()
-    
     if new_image.featured:
-        update_image_metadata(new_image.public_id, {'featured': True})
+        enqueue_metadata_update(new_image.public_id, {'featured': True})
+    db.session.commit()
     
     return jsonify(new_image.to_dict()), 201
 
@@ -66,7 +73,7 @@ def update_gallery_image(image_id):
         image.description = data['description']
     if 'featured' in data:
         image.featured = data['featured']
-        update_image_metadata(image.public_id, {'featured': image.featured})
+        enqueue_metadata_update(image.public_id, {'featured': image.featured})
     
     db.session.commit()
     return jsonify(image.to_dict()), 200
@@ -78,14 +85,13 @@ def delete_gallery_image(image_id):
     if not image:
         return jsonify({'error': 'Image not found'}), 404
     
-    cloudinary_delete_success = delete_uploaded_file(image.public_id)
-    
+    delete_queued = enqueue_delete(image.public_id)
     db.session.delete(image)
     db.session.commit()
     
     return jsonify({
         'success': True,
-        'cloudinary_deleted': cloudinary_delete_success,
+        'cloudinary_delete_queued': delete_queued,
         'message': 'Image deleted successfully'
     }), 200
 
@@ -102,12 +108,72 @@ def toggle_featured(image_id):
     
     featured = bool(data['featured'])
     image.featured = featured
+    enqueue_metadata_update(image.public_id, {'featured': featured})
     db.session.commit()
     
-    update_image_metadata(image.public_id, {'featured': featured})
-    
     return jsonify({
         'success': True,
         'featured': image.featured,
         'message': f"Image {'featured' if featured else 'unfeatured'} successfully"
     }), 200
+
+@bp.route('/bulk', methods=['POST'])
+@login_required
+def bulk_update_gallery():
+    data = request.get_json(silent=True) or {}
+    ids = data.get('ids')
+    operation = data.get('operation')
+    
+    if operation not in BULK_OPERATIONS:
+        return jsonify({'error': f"operation must be one of: {', '.join(BULK_OPERATIONS)}"}), 400
+    if not isinstance(ids, list) or not ids or not all(isinstance(image_id, int) and not isinstance(image_id, bool) for image_id in ids):
+        return jsonify({'error': 'ids must be a non-empty array of integers'}), 400
+    if len(ids) > MAX_BULK_IMAGES:
+        return jsonify({'error': f'At most {MAX_BULK_IMAGES} images can be updated at once'}), 400
+    if operation == 'retitle' and not isinstance(data.get('title'), str):
+        return jsonify({'error': 'title is required for retitle'}), 400
+    
+    ids = list(dict.fromkeys(ids))
+    
+    try:
+        found = dict(db.session.execute(
+            select(GalleryImage.id, GalleryImage.public_id).where(GalleryImage.id.in_(ids))
+        ).all())
+        matched = [image_id for image_id in ids if image_id in found]
+        public_ids = [found[image_id] for image_id in matched]
+        cloudinary_queued = False
+        
+        if matched and operation == 'delete':
+            cloudinary_queued = enqueue_deletes(public_ids)
+            db.session.execute(delete(GalleryImage).where(GalleryImage.id.in_(matched)))
+        elif matched:
+            values = {'updated_at': datetime.datetime.utcnow()}
+            if operation == 'retitle':
+                values['title'] = data['title']
+                if 'description' in data:
+                    values['description'] = data['description']
+            else:
+                values['featured'] = operation == 'feature'
+                cloudinary_queued = enqueue_metadata_updates(public_ids, {'featured': values['featured']})
+            db.session.execute(update(GalleryImage).where(GalleryImage.id.in_(matched)).values(**values))
+        
+        db.session.commit()
+        
+        results = {
+            str(image_id): {'success': True, 'public_id': found[image_id]} if image_id in found
+            else {'success': False, 'error': 'Image not found'}
+            for image_id in ids
+        }
+        return jsonify({
+            'success': len(matched) == len(ids),
+            'operation': operation,
+            'updated': len(matched),
+            'failed': len(ids) - len(matched),
+            'cloudinary_queued': cloudinary_queued,
+            'results': results
+        }), 200
+    
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.logger.error(f"Database error: {str(e)}")
+        return jsonify({'error': 'Database error occurred'}), 500
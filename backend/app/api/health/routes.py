@@ -1,6 +1,8 @@
 from flask import jsonify, current_app
 from app.models.database import db
 from app.utils.redis_utils import get_redis_client
+from app.utils.storage import storage
+from app.utils.storage_outbox import storage_outbox_backlog
 from . import bp
 
 @bp.route('', methods=['GET'])
@@ -57,4 +59,13 @@ def redis_health():
         return jsonify({
             'status': 'error',
             'message': f'Redis connection error: {str(e)}'
-        }), 500
\ No newline at end of file
+        }), 500
+
+@bp.route('/storage', methods=['GET'])
+def storage_health():
+    return jsonify({
+        'status': 'ok' if storage.enabled else 'disabled',
+        'pool_maxsize': current_app.config.get('CLOUDINARY_POOL_MAXSIZE'),
+        'metrics': storage.metrics.snapshot(),
+        'outbox': storage_outbox_backlog()
+    })
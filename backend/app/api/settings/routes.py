@@ -2,6 +2,7 @@ from flask import jsonify, request, current_app
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.database import db, Setting
 from app.api.auth.routes import login_required
+from app.utils.collection_cache import cached_json_response, invalidate_collection, SETTINGS
 from . import bp
 
 def get_all_settings():
@@ -23,6 +24,7 @@ def update_setting(key, value):
             setting = Setting(key=key, value=value)
             db.session.add(setting)
         db.session.commit()
+        invalidate_collection(SETTINGS)
         return True
     except SQLAlchemyError:
         db.session.rollback()
@@ -35,12 +37,12 @@ def delete_setting(key):
         
     db.session.delete(setting)
     db.session.commit()
+    invalidate_collection(SETTINGS)
     return True
 
 @bp.route('', methods=['GET'])
 def api_get_settings():
-    settings = get_all_settings()
-    return jsonify(settings)
+    return cached_json_response(SETTINGS, 'all', get_all_settings)
 
 @bp.route('/<key>', methods=['GET'])
 def api_get_setting(key):
@@ -106,11 +108,11 @@ def api_delete_setting(key):
 
 @bp.route('/comments-config', methods=['GET'])
 def api_get_comments_config():
-    settings_dict = get_all_settings()
+    def build():
+        settings_dict = get_all_settings()
+        return {
+            'comments_enabled': settings_dict.get('comments_enabled', 'true').lower() == 'true',
+            'comment_moderation': settings_dict.get('comment_moderation', 'false').lower() == 'true'
+        }
     
-    comments_config = {
-        'comments_enabled': settings_dict.get('comments_enabled', 'true').lower() == 'true',
-        'comment_moderation': settings_dict.get('comment_moderation', 'false').lower() == 'true'
-    }
-    
-    return jsonify(comments_config)
+    return cached_json_response(SETTINGS, 'comments-config', build)
@@ -1,23 +1,27 @@
 from flask import jsonify, current_app
 from sqlalchemy.exc import SQLAlchemyError
 from app.models.database import Setting
+from app.utils.collection_cache import cached_json_response, SETTINGS
 from . import bp
 
 @bp.route('', methods=['GET'])
 def get_social_urls():
     try:
         social_keys = ['instagram_url', 'linkedin_url', 'twitter_url']
-        settings = Setting.query.filter(Setting.key.in_(social_keys)).all()
         
-        social_urls = {}
-        for setting in settings:
-            social_urls[setting.key] = setting.value
+        def build():
+            settings = Setting.query.filter(Setting.key.in_(social_keys)).all()
             
-        for key in social_keys:
-            if key not in social_urls:
-                social_urls[key] = ''
+            social_urls = {}
+            for setting in settings:
+                social_urls[setting.key] = setting.value
                 
-        return jsonify(social_urls)
+            for key in social_keys:
+                if key not in social_urls:
+                    social_urls[key] = ''
+            return social_urls
+                
+        return cached_json_response(SETTINGS, 'social', build)
         
     except SQLAlchemyError as e:
         current_app.logger.error(f"Database error: {str(e)}")
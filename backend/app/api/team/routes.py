@@ -1,23 +1,27 @@
 from flask import jsonify, request, current_app
+from sqlalchemy import case, func
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.models.database import db, TeamMember
 from app.api.auth.routes import login_required
+from app.utils.collection_cache import cached_json_response, invalidate_collection, TEAM
 from app.api.team import bp
 
 @bp.route('/', methods=['GET'])
 def get_team_members():
     try:
         leadership_filter = request.args.get('leadership')
+        is_leadership = leadership_filter.lower() == 'true' if leadership_filter else None
         
-        if leadership_filter:
-            is_leadership = leadership_filter.lower() == 'true'
-            team_members = TeamMember.query.filter_by(leadership=is_leadership).all()
-        else:
-            team_members = TeamMember.query.all()
+        def build():
+            query = TeamMember.query
+            if is_leadership is not None:
+                query = query.filter_by(leadership=is_leadership)
+            
+            team_members = query.order_by(TeamMember.position, TeamMember.id).all()
+            return [member.to_dict() for member in team_members]
         
-        result = [member.to_dict() for member in team_members]
-        return jsonify(result)
+        return cached_json_response(TEAM, f"leadership={is_leadership}", build)
     
     except Exception as e:
         current_app.logger.error(f"Error getting team members: {str(e)}")
@@ -54,6 +58,10 @@ def create_team_member():
         }), 400
     
     try:
+        position = data.get('position')
+        if position is None:
+            position = (db.session.query(func.max(TeamMember.position)).scalar() or 0) + 1
+        
         team_member = TeamMember(
             name=data['name'],
             role=data['role'],
@@ -62,11 +70,13 @@ def create_team_member():
             leadership=data.get('leadership', False),
             github=data.get('github', ''),
             linkedin=data.get('linkedin', ''),
-            email=data.get('email', '')
+            email=data.get('email', ''),
+            position=int(position)
         )
         
         db.session.add(team_member)
         db.session.commit()
+        invalidate_collection(TEAM)
         
         return jsonify(team_member.to_dict()), 201
     
@@ -108,8 +118,11 @@ def update_team_member(member_id):
             member.linkedin = data['linkedin']
         if 'email' in data:
             member.email = data['email']
+        if 'position' in data:
+            member.position = int(data['position'])
             
         db.session.commit()
+        invalidate_collection(TEAM)
         
         return jsonify(member.to_dict())
     
@@ -132,6 +145,7 @@ def delete_team_member(member_id):
             
         db.session.delete(member)
         db.session.commit()
+        invalidate_collection(TEAM)
         
         return jsonify({"success": True, "message": "Team member deleted"})
     
@@ -154,32 +168,33 @@ def update_team_order():
     if not isinstance(data, list):
         return jsonify({"error": "Expected an array of objects"}), 400
     
+    positions = {}
+    for item in data:
+        if not isinstance(item, dict) or 'id' not in item or ('position' not in item and 'newId' not in item):
+            return jsonify({"error": "Each item must have 'id' and 'position' fields"}), 400
+        try:
+            positions[int(item['id'])] = int(item['position'] if 'position' in item else item['newId'])
+        except (TypeError, ValueError):
+            return jsonify({"error": "Team member ids and positions must be integers"}), 400
+    
+    if not positions:
+        return jsonify({"success": True, "message": "Team order updated successfully"})
+    
     try:
-        for item in data:
-            if 'id' not in item or 'newId' not in item:
-                return jsonify({"error": "Each item must have 'id' and 'newId' fields"}), 400
-            
-            member = TeamMember.query.get(item['id'])
-            if not member:
-                return jsonify({"error": f"Team member with ID {item['id']} not found"}), 404
-            
-            existing = TeamMember.query.filter_by(id=item['newId']).first()
-            if existing and existing.id != member.id:
-                return jsonify({"error": f"ID {item['newId']} is already in use"}), 409
-        
-        temp_id_base = 10000
-        
-        for i, item in enumerate(data):
-            member = TeamMember.query.get(item['id'])
-            member.id = temp_id_base + i
-        
-        db.session.flush()
+        result = db.session.execute(
+            TeamMember.__table__.update()
+            .where(TeamMember.id.in_(positions))
+            .values(position=case(positions, value=TeamMember.id))
+        )
         
-        for i, item in enumerate(data):
-            member = TeamMember.query.filter_by(id=temp_id_base + i).first()
-            member.id = item['newId']
+        if result.rowcount != len(positions):
+            db.session.rollback()
+            found = {row.id for row in db.session.query(TeamMember.id).filter(TeamMember.id.in_(positions))}
+            missing = sorted(set(positions) - found)
+            return jsonify({"error": f"Team member with ID {missing[0]} not found"}), 404
         
         db.session.commit()
+        invalidate_collection(TEAM)
         
         return jsonify({"success": True, "message": "Team order updated successfully"})
     
@@ -0,0 +1,48 @@
+import os
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from app.utils.asset_registry import sync_uploaded_assets, UPLOADS_PREFIX
+from app.utils.cloudinary_utils import allowed_file
+from app.utils.image_variants import generate_local_variants
+from app.utils.storage import storage
+from app.utils.storage_outbox import run_storage_outbox_worker
+
+@click.command('sync-uploads')
+@with_appcontext
+@click.option('--prefix', default=UPLOADS_PREFIX, show_default=True, help='Cloudinary public_id prefix to mirror.')
+def sync_uploads_command(prefix):
+    if not storage.enabled:
+        raise click.ClickException("Cloudinary credentials are not configured")
+
+    summary = sync_uploaded_assets(storage.iter_resources(prefix), prefix)
+    click.echo(f"Synced {summary['synced']} assets, removed {summary['removed']} stale entries.")
+
+@click.command('generate-image-variants')
+@with_appcontext
+def generate_image_variants_command():
+    uploads_dir = os.path.join(current_app.instance_path, 'uploads')
+    if not os.path.isdir(uploads_dir):
+        click.echo("No local uploads found.")
+        return
+
+    generated = 0
+    for entry in os.scandir(uploads_dir):
+        if not entry.is_file() or not allowed_file(entry.name):
+            continue
+        try:
+            generate_local_variants(entry.path)
+            generated += 1
+        except Exception as e:
+            click.echo(f"Skipped {entry.name}: {str(e)}", err=True)
+    click.echo(f"Generated variants for {generated} images.")
+
+@click.command('storage-outbox-worker')
+@with_appcontext
+@click.option('--once', is_flag=True, help='Apply pending changes and exit instead of polling for new ones.')
+def storage_outbox_worker_command(once):
+    if not storage.enabled:
+        raise click.ClickException("Cloudinary credentials are not configured")
+
+    total = run_storage_outbox_worker(once=once)
+    click.echo(f"Applied {total} queued Cloudinary changes.")
@@ -1,13 +1,22 @@
+import glob
 import os
 from flask import jsonify, request, current_app, send_from_directory
+from sqlalchemy import and_, insert, or_
+from sqlalchemy.exc import SQLAlchemyError
 from werkzeug.utils import secure_filename
 from app.api.auth.routes import login_required
-import cloudinary
-import cloudinary.uploader
-from app.utils.cloudinary_utils import get_uploaded_files, delete_uploaded_file, save_uploaded_image
-from app.models.database import db, GalleryImage
+from app.utils.storage import storage
+from app.utils.asset_registry import record_uploaded_asset, upsert_assets, resolve_public_id, public_id_from_url, UPLOADS_PREFIX
+from app.utils.cloudinary_utils import allowed_file
+from app.utils.pagination import encode_cursor, decode_cursor
+from app.utils.image_variants import schedule_local_variants, LOCAL_VARIANTS_DIR
+from app.models.database import db, GalleryImage, UploadedAsset
 from . import bp
 
+MAX_ASSET_PAGE_SIZE = 200
+MAX_BULK_DELETE = 1000
+MAX_BATCH_UPLOAD_FILES = 100
+
 @bp.route('', methods=['POST'])
 @login_required
 def upload_file():
@@ -24,21 +33,14 @@ def upload_file():
     description = request.form.get('description', '')
     
     try:
-        if current_app.config['CLOUDINARY_CLOUD_NAME']:
+        if storage.enabled:
             result = None
             if add_to_gallery:
-                file_url = save_uploaded_image(file)
+                file_url = storage.save_image(file)
                 if not file_url:
                     return jsonify({"error": "Failed to upload file to Cloudinary"}), 500
                 
-                path_parts = file_url.split('/')
-                try:
-                    folder_idx = path_parts.index('upload') + 1
-                    public_id = '/'.join(path_parts[folder_idx:])
-                    if '.' in public_id:
-                        public_id = public_id.split('.')[0]
-                except (ValueError, IndexError):
-                    public_id = None
+                public_id = public_id_from_url(file_url)
                 
                 if public_id:
                     gallery_image = GalleryImage(
@@ -60,7 +62,8 @@ def upload_file():
                 
                 result = {"secure_url": file_url}
             else:
-                result = cloudinary.uploader.upload(file)
+                result = storage.upload(file)
+                record_uploaded_asset(result)
             
             return jsonify({
                 "url": result['secure_url'],
@@ -70,7 +73,9 @@ def upload_file():
             filename = secure_filename(file.filename)
             uploads_dir = os.path.join(current_app.instance_path, 'uploads')
             os.makedirs(uploads_dir, exist_ok=True)
-            file.save(os.path.join(uploads_dir, filename))
+            path = os.path.join(uploads_dir, filename)
+            file.save(path)
+            schedule_local_variants(path)
             return jsonify({
                 "url": f"/api/uploads/{filename}",
                 "success": True
@@ -79,35 +84,269 @@ def upload_file():
         current_app.logger.error(f"Upload error: {str(e)}")
         return jsonify({"error": "Failed to upload file"}), 500
 
+@bp.route('/batch', methods=['POST'])
+@login_required
+def upload_files():
+    files = [file for file in request.files.getlist('files') if file.filename]
+    
+    if not files:
+        return jsonify({"error": "No files provided"}), 400
+    if len(files) > MAX_BATCH_UPLOAD_FILES:
+        return jsonify({"error": f"At most {MAX_BATCH_UPLOAD_FILES} files can be uploaded at once"}), 400
+    
+    add_to_gallery = request.form.get('add_to_gallery', 'false').lower() == 'true'
+    is_featured = request.form.get('featured', 'false').lower() == 'true'
+    title = request.form.get('title', '')
+    description = request.form.get('description', '')
+    
+    results = {}
+    accepted = []
+    for file in files:
+        if allowed_file(file.filename):
+            accepted.append(file)
+        else:
+            results[id(file)] = {"filename": file.filename, "success": False, "error": "Unsupported file type"}
+    
+    try:
+        if storage.enabled:
+            options = {'tags': ['featured']} if add_to_gallery and is_featured else {}
+            uploaded = []
+            for file, result, error in storage.upload_images(accepted, **options):
+                if error:
+                    results[id(file)] = {"filename": file.filename, "success": False, "error": error}
+                    continue
+                uploaded.append(result)
+                results[id(file)] = {
+                    "filename": file.filename,
+                    "success": True,
+                    "url": result['secure_url'],
+                    "public_id": result['public_id']
+                }
+            
+            # The files are already on Cloudinary, so a database failure below must not
+            # hide the per-file results; sync-uploads can rebuild the registry later.
+            if uploaded:
+                try:
+                    upsert_assets(uploaded)
+                    db.session.commit()
+                except SQLAlchemyError as e:
+                    db.session.rollback()
+                    current_app.logger.error(f"Could not record {len(uploaded)} uploaded assets: {str(e)}")
+            
+            gallery_ids = {}
+            gallery_failed = False
+            if add_to_gallery and uploaded:
+                try:
+                    rows = db.session.execute(
+                        insert(GalleryImage).returning(GalleryImage.id, GalleryImage.public_id),
+                        [
+                            {
+                                'title': title,
+                                'description': description,
+                                'url': result['secure_url'],
+                                'public_id': result['public_id'],
+                                'featured': is_featured
+                            }
+                            for result in uploaded
+                        ]
+                    )
+                    gallery_ids = {row.public_id: row.id for row in rows}
+                    db.session.commit()
+                except SQLAlchemyError as e:
+                    db.session.rollback()
+                    current_app.logger.error(f"Database error: {str(e)}")
+                    gallery_ids = {}
+                    gallery_failed = True
+            
+            for entry in results.values():
+                if not entry['success']:
+                    continue
+                if entry['public_id'] in gallery_ids:
+                    entry.update(gallery_id=gallery_ids[entry['public_id']], added_to_gallery=True)
+                elif gallery_failed:
+                    entry.update(added_to_gallery=False, gallery_error="Could not add image to the gallery")
+        else:
+            uploads_dir = os.path.join(current_app.instance_path, 'uploads')
+            os.makedirs(uploads_dir, exist_ok=True)
+            for file in accepted:
+                filename = secure_filename(file.filename)
+                path = os.path.join(uploads_dir, filename)
+                file.save(path)
+                schedule_local_variants(path)
+                results[id(file)] = {"filename": file.filename, "success": True, "url": f"/api/uploads/{filename}"}
+        
+        ordered = [results[id(file)] for file in files]
+        succeeded = sum(1 for entry in ordered if entry['success'])
+        return jsonify({
+            "success": succeeded == len(ordered) and not any('gallery_error' in entry for entry in ordered),
+            "uploaded": succeeded,
+            "failed": len(ordered) - succeeded,
+            "results": ordered
+        })
+    
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.logger.error(f"Database error: {str(e)}")
+        return jsonify({"error": "Database error occurred"}), 500
+    except Exception as e:
+        current_app.logger.error(f"Upload error: {str(e)}")
+        return jsonify({"error": "Failed to upload files"}), 500
+
+@bp.route('/sign', methods=['POST'])
+@login_required
+def sign_upload():
+    if not storage.enabled:
+        return jsonify({'error': 'Image uploads are not configured properly'}), 500
+    
+    data = request.get_json(silent=True) or {}
+    return jsonify(storage.sign_upload(featured=bool(data.get('featured')))), 200
+
+@bp.route('/confirm', methods=['POST'])
+@login_required
+def confirm_upload():
+    if not storage.enabled:
+        return jsonify({'error': 'Image uploads are not configured properly'}), 500
+    
+    data = request.get_json(silent=True) or {}
+    result = data.get('result')
+    
+    if not data.get('upload_token') or not isinstance(result, dict):
+        return jsonify({"error": "upload_token and result are required"}), 400
+    
+    token = storage.load_upload_token(data['upload_token'])
+    if not token:
+        return jsonify({"error": "Upload token is invalid or has expired"}), 400
+    if result.get('public_id') != token['public_id']:
+        return jsonify({"error": "Upload result does not match the signed upload"}), 400
+    
+    asset = storage.verified_upload(result)
+    if not asset:
+        return jsonify({"error": "Upload result signature is invalid"}), 400
+    
+    add_to_gallery = bool(data.get('add_to_gallery'))
+    
+    try:
+        upsert_assets([asset])
+        response = {"url": asset['secure_url'], "public_id": asset['public_id'], "success": True}
+        
+        if add_to_gallery:
+            gallery_image = GalleryImage.query.filter_by(public_id=asset['public_id']).first()
+            if not gallery_image:
+                gallery_image = GalleryImage(
+                    title=data.get('title', ''),
+                    description=data.get('description', ''),
+                    url=asset['secure_url'],
+                    public_id=asset['public_id'],
+                    featured=token['featured']
+                )
+                db.session.add(gallery_image)
+                db.session.flush()
+            response.update(gallery_id=gallery_image.id, added_to_gallery=True)
+        
+        db.session.commit()
+        return jsonify(response), 200
+    
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.logger.error(f"Database error: {str(e)}")
+        return jsonify({"error": "Database error occurred"}), 500
+
 @bp.route('/list', methods=['GET'])
 def list_files():
-    if not current_app.config.get('CLOUDINARY_CLOUD_NAME') or not current_app.config.get('CLOUDINARY_API_KEY'):
+    if not storage.enabled:
         return jsonify([]), 200
     
-    files = get_uploaded_files()
-    return jsonify(files), 200
+    limit = request.args.get('limit', type=int)
+    cursor = request.args.get('cursor')
+    prefix = request.args.get('prefix', UPLOADS_PREFIX)
+    file_format = request.args.get('format')
+    search = request.args.get('q')
+    
+    if limit is not None and limit < 1:
+        return jsonify({"error": "Limit must be a positive integer"}), 400
+    
+    try:
+        position = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        return jsonify({"error": "Invalid cursor"}), 400
+    
+    try:
+        query = UploadedAsset.query
+        
+        if prefix:
+            query = query.filter(UploadedAsset.public_id.startswith(prefix, autoescape=True))
+        if file_format:
+            query = query.filter(UploadedAsset.format == file_format.lower())
+        if search:
+            query = query.filter(UploadedAsset.filename.startswith(search, autoescape=True))
+        
+        query = query.order_by(UploadedAsset.created_at.desc(), UploadedAsset.id.desc())
+        
+        if limit is None and position is None:
+            return jsonify([asset.to_dict() for asset in query.all()]), 200
+        
+        if position:
+            created_at, asset_id = position
+            query = query.filter(or_(
+                UploadedAsset.created_at < created_at,
+                and_(UploadedAsset.created_at == created_at, UploadedAsset.id < asset_id)
+            ))
+        
+        limit = min(limit or MAX_ASSET_PAGE_SIZE, MAX_ASSET_PAGE_SIZE)
+        assets = query.limit(limit + 1).all()
+        has_more = len(assets) > limit
+        assets = assets[:limit]
+        
+        response = jsonify([asset.to_dict() for asset in assets])
+        if has_more:
+            response.headers['X-Next-Cursor'] = encode_cursor(assets[-1].created_at, assets[-1].id)
+        return response, 200
+    
+    except SQLAlchemyError as e:
+        current_app.logger.error(f"Database error: {str(e)}")
+        return jsonify({"error": "Database error occurred"}), 500
+
+@bp.route('/delete', methods=['POST'])
+@login_required
+def delete_files():
+    if not storage.enabled:
+        return jsonify({'error': 'Image uploads are not configured properly'}), 500
+    
+    data = request.get_json(silent=True) or {}
+    identifiers = data.get('identifiers')
+    
+    if not isinstance(identifiers, list) or not identifiers or not all(isinstance(item, str) for item in identifiers):
+        return jsonify({'error': 'identifiers must be a non-empty array of strings'}), 400
+    if len(identifiers) > MAX_BULK_DELETE:
+        return jsonify({'error': f'At most {MAX_BULK_DELETE} files can be deleted at once'}), 400
+    
+    try:
+        summary = storage.delete_files(identifiers)
+        
+        if summary['deleted']:
+            GalleryImage.query.filter(GalleryImage.public_id.in_(summary['deleted'])).delete(synchronize_session=False)
+            db.session.commit()
+        
+        return jsonify({'success': not summary['failed'], **summary}), 200
+    
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.logger.error(f"Database error: {str(e)}")
+        return jsonify({"error": "Database error occurred"}), 500
 
 @bp.route('/<path:identifier>', methods=['DELETE'])
 @login_required
 def delete_file(identifier):
-    if not current_app.config.get('CLOUDINARY_CLOUD_NAME') or not current_app.config.get('CLOUDINARY_API_KEY'):
+    if not storage.enabled:
         return jsonify({'error': 'Image uploads are not configured properly'}), 500
     
-    if identifier.startswith('http') and 'cloudinary.com' in identifier:
-        path_parts = identifier.split('/')
-        try:
-            folder_idx = path_parts.index('upload') + 1
-            public_id = '/'.join(path_parts[folder_idx:])
-            if '.' in public_id:
-                public_id = public_id.split('.')[0]
-                
-            GalleryImage.delete_by_public_id(public_id)
-        except (ValueError, IndexError):
-            pass
-    elif identifier.startswith('blog_uploads/'):
-        GalleryImage.delete_by_public_id(identifier)
+    public_id = resolve_public_id(identifier)
+    if not public_id:
+        current_app.logger.error(f"Could not determine public_id for: {identifier}")
+        return jsonify({'error': 'File not found or could not be deleted'}), 404
     
-    if delete_uploaded_file(identifier):
+    if storage.delete_file(public_id):
+        GalleryImage.delete_by_public_id(public_id)
         return jsonify({
             'success': True,
             'message': 'File deleted successfully from Cloudinary'
@@ -115,9 +354,26 @@ def delete_file(identifier):
     else:
         return jsonify({'error': 'File not found or could not be deleted'}), 404
 
+@bp.route(f'/{LOCAL_VARIANTS_DIR}/<filename>')
+def serve_variant(filename):
+    if storage.enabled:
+        return jsonify({"error": "File not found"}), 404
+    
+    uploads_dir = os.path.join(current_app.instance_path, 'uploads')
+    variants_dir = os.path.join(uploads_dir, LOCAL_VARIANTS_DIR)
+    if os.path.isfile(os.path.join(variants_dir, secure_filename(filename))):
+        return send_from_directory(variants_dir, filename)
+    
+    # Variants are generated in the background, so fall back to the original until they exist
+    stem = filename.rsplit('-', 1)[0]
+    originals = glob.glob(os.path.join(glob.escape(uploads_dir), f"{glob.escape(secure_filename(stem))}.*"))
+    if not originals:
+        return jsonify({"error": "File not found"}), 404
+    return send_from_directory(uploads_dir, os.path.basename(originals[0]))
+
 @bp.route('/<filename>')
 def serve_file(filename):
-    if current_app.config['CLOUDINARY_CLOUD_NAME']:
+    if storage.enabled:
         return jsonify({"error": "File not found"}), 404
     return send_from_directory(
         os.path.join(current_app.instance_path, 'uploads'),
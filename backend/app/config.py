@@ -1,5 +1,14 @@
 import os
 from datetime import timedelta
+from urllib.parse import quote
+
+def redis_uri():
+    scheme = 'rediss' if os.environ.get('REDIS_SSL', 'False').lower() == 'true' else 'redis'
+    password = os.environ.get('REDIS_PASSWORD')
+    auth = f":{quote(password, safe='')}@" if password else ''
+    host = os.environ.get('REDIS_HOST', 'localhost')
+    port = int(os.environ.get('REDIS_PORT', 6379))
+    return f"{scheme}://{auth}{host}:{port}"
 
 class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY')
@@ -10,6 +19,16 @@ class Config:
     CLOUDINARY_CLOUD_NAME = os.environ.get('CLOUDINARY_CLOUD_NAME', '')
     CLOUDINARY_API_KEY = os.environ.get('CLOUDINARY_API_KEY', '')
     CLOUDINARY_API_SECRET = os.environ.get('CLOUDINARY_API_SECRET', '')
+    CLOUDINARY_POOL_MAXSIZE = int(os.environ.get('CLOUDINARY_POOL_MAXSIZE', 10))
+    CLOUDINARY_CONNECT_TIMEOUT = float(os.environ.get('CLOUDINARY_CONNECT_TIMEOUT', 5))
+    CLOUDINARY_READ_TIMEOUT = float(os.environ.get('CLOUDINARY_READ_TIMEOUT', 60))
+    CLOUDINARY_UPLOAD_WORKERS = int(os.environ.get('CLOUDINARY_UPLOAD_WORKERS', 4))
+    DIRECT_UPLOAD_TTL = int(os.environ.get('DIRECT_UPLOAD_TTL', 900))
+    IMAGE_VARIANT_WORKERS = int(os.environ.get('IMAGE_VARIANT_WORKERS', 2))
+    STORAGE_OUTBOX_BATCH_SIZE = int(os.environ.get('STORAGE_OUTBOX_BATCH_SIZE', 500))
+    STORAGE_OUTBOX_MAX_ATTEMPTS = int(os.environ.get('STORAGE_OUTBOX_MAX_ATTEMPTS', 8))
+    STORAGE_OUTBOX_RETRY_DELAY = int(os.environ.get('STORAGE_OUTBOX_RETRY_DELAY', 30))
+    STORAGE_OUTBOX_POLL_INTERVAL = float(os.environ.get('STORAGE_OUTBOX_POLL_INTERVAL', 2))
     
     PERMANENT_SESSION_LIFETIME = timedelta(days=1)
     SESSION_COOKIE_SECURE = True
@@ -24,6 +43,45 @@ class Config:
     SESSION_USE_SIGNER = True
 
     TURNSTILE_SECRET_KEY = os.environ.get("TURNSTILE_SECRET_KEY")
+    CHECKIN_TOKEN_SECRET = os.environ.get('CHECKIN_TOKEN_SECRET')
+
+    # Number of trusted proxies setting X-Forwarded-For; leave at 0 unless the app
+    # sits behind exactly that many, or clients can spoof their address.
+    PROXY_FIX_X_FOR = int(os.environ.get('PROXY_FIX_X_FOR', 0))
+
+    PARTICIPANT_IMPORT_BATCH_SIZE = int(os.environ.get('PARTICIPANT_IMPORT_BATCH_SIZE', 500))
+    EVENT_STATUS_CACHE_TTL = int(os.environ.get('EVENT_STATUS_CACHE_TTL', 10))
+    ACHIEVEMENT_CACHE_TTL = int(os.environ.get('ACHIEVEMENT_CACHE_TTL', 3600))
+    ACHIEVEMENT_NEGATIVE_CACHE_TTL = int(os.environ.get('ACHIEVEMENT_NEGATIVE_CACHE_TTL', 60))
+    EVENT_STATS_CACHE_TTL = int(os.environ.get('EVENT_STATS_CACHE_TTL', 3600))
+    COLLECTION_CACHE_MAX_AGE = int(os.environ.get('COLLECTION_CACHE_MAX_AGE', 300))
+    SEAT_COUNTER_TTL = int(os.environ.get('SEAT_COUNTER_TTL', 86400))
+
+    REGISTRATION_STREAM_KEY = os.environ.get('REGISTRATION_STREAM_KEY', 'registrations:stream')
+    REGISTRATION_RECEIPT_TTL = int(os.environ.get('REGISTRATION_RECEIPT_TTL', 86400))
+    REGISTRATION_WORKER_BATCH_SIZE = int(os.environ.get('REGISTRATION_WORKER_BATCH_SIZE', 200))
+    REGISTRATION_WORKER_BLOCK_MS = int(os.environ.get('REGISTRATION_WORKER_BLOCK_MS', 2000))
+    REGISTRATION_WORKER_CLAIM_IDLE_MS = int(os.environ.get('REGISTRATION_WORKER_CLAIM_IDLE_MS', 60000))
+
+    RATELIMIT_ENABLED = os.environ.get('RATELIMIT_ENABLED', 'True').lower() == 'true'
+    RATELIMIT_STORAGE_URI = os.environ.get('RATELIMIT_STORAGE_URI') or redis_uri()
+    RATELIMIT_STORAGE_OPTIONS = {'socket_connect_timeout': 1, 'socket_timeout': 1}
+    RATELIMIT_KEY_PREFIX = 'ratelimit'
+    RATELIMIT_STRATEGY = 'moving-window'
+    RATELIMIT_HEADERS_ENABLED = True
+    RATELIMIT_IN_MEMORY_FALLBACK_ENABLED = True
+    RATELIMIT_SWALLOW_ERRORS = True
+
+    RATELIMIT_LOGIN = os.environ.get('RATELIMIT_LOGIN', '5 per minute;30 per hour')
+    RATELIMIT_LOGIN_GLOBAL = os.environ.get('RATELIMIT_LOGIN_GLOBAL', '60 per minute')
+    RATELIMIT_COMMENT = os.environ.get('RATELIMIT_COMMENT', '5 per minute;50 per day')
+    RATELIMIT_COMMENT_GLOBAL = os.environ.get('RATELIMIT_COMMENT_GLOBAL', '120 per minute')
+    RATELIMIT_CONTACT = os.environ.get('RATELIMIT_CONTACT', '3 per minute;20 per day')
+    RATELIMIT_CONTACT_GLOBAL = os.environ.get('RATELIMIT_CONTACT_GLOBAL', '60 per minute')
+    RATELIMIT_REGISTRATION = os.environ.get('RATELIMIT_REGISTRATION', '10 per minute;50 per hour')
+    RATELIMIT_REGISTRATION_GLOBAL = os.environ.get('RATELIMIT_REGISTRATION_GLOBAL', '1200 per minute')
+    RATELIMIT_CERTIFICATE = os.environ.get('RATELIMIT_CERTIFICATE', '10 per minute;60 per hour')
+    RATELIMIT_CERTIFICATE_GLOBAL = os.environ.get('RATELIMIT_CERTIFICATE_GLOBAL', '120 per minute')
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -39,6 +97,7 @@ class TestingConfig(Config):
     DATABASE = 'sqlite:///:memory:'
     DATABASE_URL = None
     SESSION_COOKIE_SECURE = False
+    RATELIMIT_STORAGE_URI = 'memory://'
 
 config = {
     'development': DevelopmentConfig,
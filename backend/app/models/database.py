@@ -1,8 +1,11 @@
 import click
-from flask import g
+from flask import g, jsonify, request
 from flask.cli import with_appcontext
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import inspect, text, bindparam
+from sqlalchemy.schema import CreateColumn, CreateIndex
 from werkzeug.security import generate_password_hash, check_password_hash
+from app.utils.image_variants import responsive_image
 import os
 from datetime import datetime
 
@@ -56,9 +59,11 @@ class Comment(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     author_name = db.Column(db.String(100), nullable=False)
     content = db.Column(db.Text, nullable=False)
-    created_at = db.Column(db.String, nullable=False)
+    created_at = db.Column(db.DateTime, nullable=False)
     page_id = db.Column(db.Integer, db.ForeignKey('pages.id'), nullable=False)
     
+    __table_args__ = (db.Index('ix_comments_page_id_created_at_id', 'page_id', 'created_at', 'id'),)
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -88,8 +93,15 @@ class TeamMember(db.Model):
     github = db.Column(db.String(255))
     linkedin = db.Column(db.String(255))
     email = db.Column(db.String(255))
+    position = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    
+    __table_args__ = (
+        db.Index('ix_team_members_position_id', 'position', 'id'),
+        db.Index('ix_team_members_leadership_position_id', 'leadership', 'position', 'id'),
+    )
     
     def to_dict(self):
+        image = responsive_image(self.image)
         return {
             'id': self.id,
             'name': self.name,
@@ -99,7 +111,10 @@ class TeamMember(db.Model):
             'leadership': self.leadership,
             'github': self.github,
             'linkedin': self.linkedin,
-            'email': self.email
+            'email': self.email,
+            'position': self.position,
+            'image_variants': image['variants'],
+            'image_srcset': image['srcset']
         }
 
 class GalleryImage(db.Model):
@@ -122,8 +137,9 @@ class GalleryImage(db.Model):
             'url': self.url,
             'public_id': self.public_id,
             'featured': self.featured,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            **responsive_image(self.url)
         }
     
     @classmethod
@@ -159,6 +175,48 @@ class GalleryImage(db.Model):
             return True
         return False
 
+class UploadedAsset(db.Model):
+    __tablename__ = 'uploaded_assets'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    public_id = db.Column(db.String(255), nullable=False, unique=True)
+    filename = db.Column(db.String(255), nullable=False, index=True)
+    url = db.Column(db.String(500), nullable=False)
+    resource_type = db.Column(db.String(20))
+    format = db.Column(db.String(20))
+    size = db.Column(db.BigInteger, default=0)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    synced_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (db.Index('ix_uploaded_assets_created_at_id', 'created_at', 'id'),)
+    
+    def to_dict(self):
+        return {
+            'filename': self.filename,
+            'url': self.url,
+            'size': self.size,
+            'format': self.format,
+            'created': self.created_at,
+            'public_id': self.public_id
+        }
+
+class StorageOutbox(db.Model):
+    __tablename__ = 'storage_outbox'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    operation = db.Column(db.String(20), nullable=False)
+    public_id = db.Column(db.String(255), nullable=False)
+    tags = db.Column(db.Text)
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    last_error = db.Column(db.Text)
+    available_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_storage_outbox_available_at_id', 'available_at', 'id'),
+        db.Index('ix_storage_outbox_public_id_id', 'public_id', 'id'),
+    )
+
 class SentEmail(db.Model):
     __tablename__ = "sent_emails"
     
@@ -181,7 +239,7 @@ class SentEmail(db.Model):
             'bcc': self.bcc_addresses,
             'subject': self.subject,
             'content': self.content,
-            'sent_at': self.sent_at.isoformat() if self.sent_at else None,
+            'sent_at': self.sent_at,
             'deleted': self.is_deleted
         }
 
@@ -213,27 +271,57 @@ class Event(db.Model):
     id = db.Column(db.String(50), primary_key=True)
     name = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text)
-    event_date = db.Column(db.String(10), nullable=False)
+    event_date = db.Column(db.String(10), nullable=False, index=True)
     accepting_submissions = db.Column(db.Boolean, default=True)
+    surge_mode = db.Column(db.Boolean, nullable=False, default=False, server_default=db.false())
+    capacity = db.Column(db.Integer)
     instructor = db.Column(db.String(255))
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     participants = db.relationship('Participant', backref='event', lazy=True, cascade="all, delete-orphan")
     
-    def to_dict(self):
+    def to_dict(self, participant_count=None, attended_count=None):
+        if participant_count is None:
+            participant_count, attended_count = Event.participant_counts([self.id]).get(self.id, (0, 0))
+        
         return {
             'id': self.id,
             'name': self.name,
             'description': self.description,
             'event_date': self.event_date,
             'accepting_submissions': self.accepting_submissions,
+            'surge_mode': self.surge_mode,
+            'capacity': self.capacity,
             'instructor': self.instructor,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
-            'participant_count': len(self.participants) if hasattr(self, 'participants') else 0
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
+            'participant_count': participant_count,
+            'attended_count': attended_count or 0
         }
     
+    @staticmethod
+    def _counts_query():
+        return db.session.query(
+            Participant.event_id.label('event_id'),
+            db.func.count(Participant.id).label('participant_count'),
+            db.func.sum(db.case((Participant.attended.is_(True), 1), else_=0)).label('attended_count')
+        ).group_by(Participant.event_id)
+    
+    @classmethod
+    def participant_counts(cls, event_ids):
+        query = cls._counts_query().filter(Participant.event_id.in_(event_ids))
+        return {row.event_id: (row.participant_count, int(row.attended_count or 0)) for row in query}
+    
+    @classmethod
+    def query_with_counts(cls):
+        counts = cls._counts_query().subquery()
+        return db.session.query(
+            cls,
+            db.func.coalesce(counts.c.participant_count, 0),
+            db.func.coalesce(counts.c.attended_count, 0)
+        ).outerjoin(counts, counts.c.event_id == cls.id)
+    
     @classmethod
     def generate_id(cls, name, event_date):
         import re
@@ -262,7 +350,24 @@ class Participant(db.Model):
     
     event_id = db.Column(db.String(50), db.ForeignKey('events.id'), nullable=False)
     
-    __table_args__ = (db.UniqueConstraint('student_id', 'event_id', name='unique_participant_per_event'),)
+    __table_args__ = (
+        db.UniqueConstraint('student_id', 'event_id', name='unique_participant_per_event'),
+        db.Index('ix_participants_event_id_attended', 'event_id', 'attended'),
+        db.Index('ix_participants_event_college_student', 'event_id', 'college_code', 'student_id'),
+        db.Index('ix_participants_event_id_created_at', 'event_id', 'created_at', 'id'),
+        db.Index(
+            'ix_participants_event_name_lower', 'event_id', db.func.lower(name).label('name_lower'),
+            postgresql_ops={'name_lower': 'text_pattern_ops'}
+        ),
+        db.Index(
+            'ix_participants_event_email_lower', 'event_id', db.func.lower(email).label('email_lower'),
+            postgresql_ops={'email_lower': 'text_pattern_ops'}
+        ),
+        db.Index(
+            'ix_participants_event_student_id_lower', 'event_id', db.func.lower(student_id).label('student_id_lower'),
+            postgresql_ops={'student_id_lower': 'text_pattern_ops'}
+        ),
+    )
     
     def to_dict(self):
         return {
@@ -277,7 +382,7 @@ class Participant(db.Model):
             'participant_id': f"{self.college_code}{self.student_id}",
             'attended': self.attended,
             'event_id': self.event_id,
-            'created_at': self.created_at.isoformat() if self.created_at else None
+            'created_at': self.created_at
         }
 
 def get_db():
@@ -319,12 +424,116 @@ def init_db():
     
     db.session.commit()
 
+def get_column_type(table_name, column_name):
+    for column in inspect(db.engine).get_columns(table_name):
+        if column['name'] == column_name:
+            return column['type']
+    return None
+
+def migrate_comment_timestamps():
+    column_type = get_column_type('comments', 'created_at')
+    if column_type is None:
+        return
+    
+    if db.engine.dialect.name == 'postgresql':
+        if not isinstance(column_type, db.DateTime):
+            with db.engine.begin() as conn:
+                conn.execute(text(
+                    "ALTER TABLE comments ALTER COLUMN created_at "
+                    "TYPE TIMESTAMP WITHOUT TIME ZONE USING created_at::timestamp"
+                ))
+        return
+    
+    with db.engine.begin() as conn:
+        rows = conn.execute(text("SELECT id, created_at FROM comments WHERE created_at LIKE '%T%'")).all()
+        if rows:
+            conn.execute(
+                Comment.__table__.update().where(Comment.__table__.c.id == bindparam('comment_id')),
+                [{'comment_id': row.id, 'created_at': datetime.fromisoformat(row.created_at)} for row in rows]
+            )
+
+def missing_columns():
+    inspector = inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    
+    missing = []
+    for table in db.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+        missing.extend(column for column in table.columns if column.name not in existing_columns)
+    return missing
+
+def add_missing_columns():
+    for column in missing_columns():
+        column_ddl = CreateColumn(column).compile(dialect=db.engine.dialect)
+        with db.engine.begin() as conn:
+            conn.execute(text(f"ALTER TABLE {column.table.name} ADD COLUMN {column_ddl}"))
+
+def pending_schema_upgrades():
+    pending = [f"missing column {column.table.name}.{column.name}" for column in missing_columns()]
+    
+    column_type = get_column_type('comments', 'created_at')
+    if column_type is not None:
+        if db.engine.dialect.name == 'postgresql':
+            outdated = not isinstance(column_type, db.DateTime)
+        else:
+            with db.engine.connect() as conn:
+                outdated = conn.execute(text("SELECT 1 FROM comments WHERE created_at LIKE '%T%' LIMIT 1")).first() is not None
+        if outdated:
+            pending.append("comments.created_at still holds ISO strings")
+    return pending
+
+def backfill_team_positions():
+    with db.engine.begin() as conn:
+        positioned = conn.execute(text("SELECT COUNT(*) FROM team_members WHERE position <> 0")).scalar()
+        if not positioned:
+            conn.execute(text("UPDATE team_members SET position = id"))
+
+def normalize_gallery_public_ids():
+    from app.utils.asset_registry import normalize_public_id
+    
+    with db.engine.begin() as conn:
+        rows = conn.execute(text("SELECT id, public_id FROM gallery_images WHERE public_id LIKE 'v%/%'")).all()
+        existing = set(conn.execute(text("SELECT public_id FROM gallery_images")).scalars())
+        updates = []
+        for row in rows:
+            public_id = normalize_public_id(row.public_id)
+            if public_id == row.public_id or public_id in existing:
+                continue
+            existing.add(public_id)
+            updates.append({'image_id': row.id, 'public_id': public_id})
+        if updates:
+            conn.execute(
+                GalleryImage.__table__.update().where(GalleryImage.__table__.c.id == bindparam('image_id')),
+                updates
+            )
+
+def upgrade_schema():
+    add_missing_columns()
+    migrate_comment_timestamps()
+    backfill_team_positions()
+    normalize_gallery_public_ids()
+    create_missing_indexes()
+
+def create_missing_indexes():
+    with db.engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                conn.execute(CreateIndex(index, if_not_exists=True))
+
 @click.command('init-db')
 @with_appcontext
 def init_db_command():
     init_db()
     click.echo('Initialized the database.')
 
+@click.command('upgrade-db')
+@with_appcontext
+def upgrade_db_command():
+    upgrade_schema()
+    click.echo('Upgraded the database schema.')
+
 def init_app(app):
     database_url = os.environ.get('DATABASE_URL') or app.config.get('DATABASE_URL')
     
@@ -343,6 +552,7 @@ def init_app(app):
     
     db.init_app(app)
     app.cli.add_command(init_db_command)
+    app.cli.add_command(upgrade_db_command)
     
     @app.teardown_appcontext
     def shutdown_db_session(exception=None):
@@ -353,3 +563,15 @@ def init_app(app):
     
     with app.app_context():
         db.create_all()
+        pending = pending_schema_upgrades()
+    
+    if pending:
+        app.logger.error(
+            f"Database schema is out of date ({'; '.join(pending)}). "
+            "Run 'flask upgrade-db' and restart the app."
+        )
+        
+        @app.before_request
+        def reject_outdated_schema():
+            if request.path.startswith('/api/') and not request.path.startswith('/api/health'):
+                return jsonify({"error": "Database schema is out of date, run 'flask upgrade-db'"}), 503
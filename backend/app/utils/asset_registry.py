@@ -0,0 +1,135 @@
+import datetime
+import re
+from flask import current_app
+from sqlalchemy import delete, select
+from sqlalchemy.exc import SQLAlchemyError
+from app.models.database import db, UploadedAsset
+from app.utils.db_utils import dialect_insert
+
+UPLOADS_PREFIX = 'blog_uploads'
+DELETE_CHUNK_SIZE = 500
+VERSION_SEGMENT = re.compile(r'^v\d+$')
+
+def parse_cloudinary_timestamp(value):
+    if not value:
+        return datetime.datetime.utcnow()
+    parsed = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def asset_row(resource):
+    return {
+        'public_id': resource['public_id'],
+        'filename': resource['public_id'].split('/')[-1],
+        'url': resource['secure_url'],
+        'resource_type': resource.get('resource_type'),
+        'format': resource.get('format'),
+        'size': resource.get('bytes', 0),
+        'created_at': parse_cloudinary_timestamp(resource.get('created_at')),
+        'synced_at': datetime.datetime.utcnow(),
+    }
+
+def upsert_assets(resources):
+    if not resources:
+        return
+    stmt = dialect_insert(UploadedAsset.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=['public_id'],
+        set_={column: stmt.excluded[column] for column in ['filename', 'url', 'resource_type', 'format', 'size', 'created_at', 'synced_at']}
+    )
+    db.session.execute(stmt, [asset_row(resource) for resource in resources])
+
+def record_uploaded_asset(resource):
+    try:
+        upsert_assets([resource])
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.logger.error(f"Could not record uploaded asset {resource.get('public_id')}: {str(e)}")
+
+def normalize_public_id(public_id):
+    first, _, rest = public_id.partition('/')
+    return rest if rest and VERSION_SEGMENT.match(first) else public_id
+
+def public_id_from_url(url):
+    path_parts = url.split('?', 1)[0].split('/')
+    try:
+        parts = path_parts[path_parts.index('upload') + 1:]
+    except ValueError:
+        return None
+    if parts and VERSION_SEGMENT.match(parts[0]):
+        parts = parts[1:]
+    if not parts:
+        return None
+    public_id = '/'.join(parts)
+    if '.' in parts[-1]:
+        public_id = public_id.rsplit('.', 1)[0]
+    return public_id
+
+def resolve_public_ids(identifiers):
+    resolved = {}
+    filenames = set()
+
+    for identifier in identifiers:
+        if identifier.startswith('http') and 'cloudinary.com' in identifier:
+            resolved[identifier] = public_id_from_url(identifier)
+        elif identifier.startswith(f"{UPLOADS_PREFIX}/"):
+            resolved[identifier] = identifier
+        elif normalize_public_id(identifier) != identifier:
+            resolved[identifier] = normalize_public_id(identifier)
+        elif '/' not in identifier:
+            filenames.add(identifier)
+            filenames.add(identifier.rsplit('.', 1)[0])
+        else:
+            resolved[identifier] = None
+
+    if filenames:
+        by_filename = {}
+        rows = db.session.execute(
+            select(UploadedAsset.filename, UploadedAsset.public_id)
+            .where(UploadedAsset.filename.in_(filenames))
+            .order_by(UploadedAsset.created_at.desc())
+        )
+        for filename, public_id in rows:
+            by_filename.setdefault(filename, public_id)
+        for identifier in identifiers:
+            if identifier not in resolved:
+                resolved[identifier] = by_filename.get(identifier) or by_filename.get(identifier.rsplit('.', 1)[0])
+
+    return resolved
+
+def resolve_public_id(identifier):
+    return resolve_public_ids([identifier])[identifier]
+
+def forget_uploaded_assets(public_ids):
+    if not public_ids:
+        return
+    try:
+        db.session.execute(delete(UploadedAsset.__table__).where(UploadedAsset.public_id.in_(public_ids)))
+        db.session.commit()
+    except SQLAlchemyError as e:
+        db.session.rollback()
+        current_app.logger.error(f"Could not remove {len(public_ids)} uploaded assets: {str(e)}")
+
+def sync_uploaded_assets(pages, prefix=UPLOADS_PREFIX):
+    summary = {'synced': 0, 'removed': 0}
+    seen = set()
+
+    for resources in pages:
+        upsert_assets(resources)
+        db.session.commit()
+        seen.update(resource['public_id'] for resource in resources)
+        summary['synced'] += len(resources)
+
+    existing = db.session.execute(
+        select(UploadedAsset.public_id).where(UploadedAsset.public_id.startswith(prefix, autoescape=True))
+    ).scalars()
+    stale = [public_id for public_id in existing if public_id not in seen]
+    for start in range(0, len(stale), DELETE_CHUNK_SIZE):
+        chunk = stale[start:start + DELETE_CHUNK_SIZE]
+        db.session.execute(delete(UploadedAsset.__table__).where(UploadedAsset.public_id.in_(chunk)))
+        db.session.commit()
+    summary['removed'] = len(stale)
+
+    return summary
@@ -0,0 +1,62 @@
+import base64
+import hashlib
+import hmac
+from io import BytesIO
+from flask import current_app
+import qrcode
+
+TOKEN_VERSION = 'c1'
+SIGNATURE_BYTES = 16
+
+def _b64encode(raw):
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def _b64decode(value):
+    return base64.urlsafe_b64decode(value + '=' * (-len(value) % 4))
+
+def event_checkin_key(event_id):
+    secret = current_app.config['CHECKIN_TOKEN_SECRET'] or current_app.config['SECRET_KEY']
+    return hmac.new(secret.encode('utf-8'), f"checkin:{event_id}".encode('utf-8'), hashlib.sha256).digest()
+
+def _sign(key, payload):
+    return hmac.new(key, payload, hashlib.sha256).digest()[:SIGNATURE_BYTES]
+
+def issue_checkin_token(participant):
+    payload = f"{TOKEN_VERSION}|{participant.event_id}|{participant.college_code}|{participant.student_id}".encode('utf-8')
+    signature = _sign(event_checkin_key(participant.event_id), payload)
+    return f"{_b64encode(payload)}.{_b64encode(signature)}"
+
+def verify_checkin_token(token, event_id=None):
+    try:
+        encoded_payload, encoded_signature = token.split('.', 1)
+        payload = _b64decode(encoded_payload)
+        signature = _b64decode(encoded_signature)
+        version, token_event_id, college_code, student_id = payload.decode('utf-8').split('|', 3)
+    except (AttributeError, ValueError):
+        raise ValueError("Malformed check-in token")
+
+    if version != TOKEN_VERSION:
+        raise ValueError("Unsupported check-in token version")
+    if event_id is not None and token_event_id != event_id:
+        raise ValueError("Check-in token belongs to a different event")
+    if not hmac.compare_digest(signature, _sign(event_checkin_key(token_event_id), payload)):
+        raise ValueError("Invalid check-in token signature")
+
+    return {
+        'event_id': token_event_id,
+        'college_code': college_code,
+        'student_id': student_id,
+    }
+
+def checkin_qr_png(token):
+    qr = qrcode.QRCode(
+        error_correction=qrcode.constants.ERROR_CORRECT_M,
+        box_size=8,
+        border=2,
+    )
+    qr.add_data(token)
+    qr.make(fit=True)
+    buffer = BytesIO()
+    qr.make_image(fill='black', back_color='white').save(buffer, format='PNG')
+    buffer.seek(0)
+    return buffer
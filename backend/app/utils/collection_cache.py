@@ -0,0 +1,75 @@
+import threading
+import time
+import uuid
+from flask import current_app, jsonify
+from redis.exceptions import RedisError
+from app.utils.redis_utils import get_cache_client
+
+TEAM = 'team'
+SETTINGS = 'settings'
+
+class VersionedCache:
+    def __init__(self, namespace='collections'):
+        self.namespace = namespace
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _version_key(self, collection):
+        return f"{self.namespace}:version:{collection}"
+
+    def current_version(self, collection):
+        redis_client = get_cache_client()
+        key = self._version_key(collection)
+        version = redis_client.get(key)
+        if version is None:
+            redis_client.set(key, uuid.uuid4().hex, nx=True)
+            version = redis_client.get(key)
+        return version
+
+    def get_or_compute(self, collection, variant, compute):
+        try:
+            version = self.current_version(collection)
+        except RedisError as e:
+            current_app.logger.warning(f"Collection cache version check failed for {collection}: {str(e)}")
+            self.discard(collection)
+            return compute()
+
+        # A failed bump leaves other workers on a stale version, so entries also expire
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((collection, variant))
+        if entry is not None and entry[0] == version and now - entry[2] < current_app.config['COLLECTION_CACHE_MAX_AGE']:
+            return entry[1]
+
+        payload = compute()
+        with self._lock:
+            self._entries[(collection, variant)] = (version, payload, now)
+        return payload
+
+    def discard(self, *collections):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] in collections]:
+                del self._entries[key]
+
+    def bump(self, *collections):
+        self.discard(*collections)
+        try:
+            pipe = get_cache_client().pipeline(transaction=False)
+            for collection in collections:
+                pipe.set(self._version_key(collection), uuid.uuid4().hex)
+            pipe.execute()
+        except RedisError as e:
+            current_app.logger.warning(f"Collection cache invalidation failed for {', '.join(collections)}: {str(e)}")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+collection_cache = VersionedCache()
+
+def cached_json_response(collection, variant, build):
+    payload = collection_cache.get_or_compute(collection, variant, lambda: jsonify(build()).get_data())
+    return current_app.response_class(payload, mimetype='application/json')
+
+def invalidate_collection(*collections):
+    collection_cache.bump(*collections)
@@ -0,0 +1,10 @@
+from sqlalchemy.dialects import postgresql, sqlite
+from app.models.database import db
+
+def dialect_insert(table):
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        return postgresql.insert(table)
+    if dialect == 'sqlite':
+        return sqlite.insert(table)
+    raise NotImplementedError(f"Upserts are not supported on {dialect}")
@@ -0,0 +1,46 @@
+from flask import current_app
+from redis.exceptions import RedisError
+from app.utils.redis_utils import get_cache_client
+
+ALL_EVENTS = '*'
+NEGATIVE_RESULT = b'{"eligible":false}'
+
+def _version_key(event_id):
+    return f"events:version:{event_id}"
+
+def get_cached(event_id, name):
+    try:
+        redis_client = get_cache_client()
+        version = (redis_client.get(_version_key(event_id)) or b'0').decode('utf-8')
+        key = f"events:cache:{event_id}:{version}:{name}"
+        return key, redis_client.get(key)
+    except RedisError as e:
+        current_app.logger.warning(f"Event cache read failed: {str(e)}")
+        return None, None
+
+def set_cached(key, payload, ttl):
+    if key is None:
+        return
+    try:
+        get_cache_client().set(key, payload, ex=ttl)
+    except RedisError as e:
+        current_app.logger.warning(f"Event cache write failed: {str(e)}")
+
+def invalidate_event_cache(event_id):
+    try:
+        pipe = get_cache_client().pipeline(transaction=False)
+        pipe.incr(_version_key(event_id))
+        pipe.incr(_version_key(ALL_EVENTS))
+        pipe.execute()
+    except RedisError as e:
+        current_app.logger.warning(f"Event cache invalidation failed for {event_id}: {str(e)}")
+
+def get_cached_eligibility(event_id, college_code, student_id):
+    return get_cached(event_id, f"achievement:{college_code}:{student_id}")
+
+def cache_eligibility(key, payload):
+    if payload == NEGATIVE_RESULT:
+        ttl = current_app.config['ACHIEVEMENT_NEGATIVE_CACHE_TTL']
+    else:
+        ttl = current_app.config['ACHIEVEMENT_CACHE_TTL']
+    set_cached(key, payload, ttl)
@@ -0,0 +1,91 @@
+from flask import current_app
+from redis.exceptions import RedisError
+from sqlalchemy import func, select
+from app.models.database import db, Event, Participant
+from app.utils.redis_utils import get_redis_client
+
+SEAT_FULL = 0
+SEAT_RESERVED = 1
+SEAT_HELD = 2
+SEAT_COUNTER_MISSING = -1
+
+LOADED_MARKER = ''
+LOAD_CHUNK_SIZE = 1000
+
+RESERVE_SEAT_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return -1
+end
+if redis.call('SISMEMBER', KEYS[1], ARGV[1]) == 1 then
+    return 2
+end
+if redis.call('SCARD', KEYS[1]) - 1 >= tonumber(ARGV[2]) then
+    return 0
+end
+redis.call('SADD', KEYS[1], ARGV[1])
+return 1
+"""
+
+def _seats_key(event_id):
+    return f"events:seats:{event_id}"
+
+def parse_capacity(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, bool) or not str(value).strip().isdigit() or int(value) < 1:
+        raise ValueError("Capacity must be a positive integer")
+    return int(value)
+
+def load_seat_holders(redis_client, event_id):
+    from app.utils.registration_queue import pending_key
+
+    key = _seats_key(event_id)
+    holders = db.session.execute(select(Participant.student_id).where(Participant.event_id == event_id)).scalars().all()
+    holders.extend(member.decode('utf-8') for member in redis_client.hkeys(pending_key(event_id)))
+
+    pipe = redis_client.pipeline(transaction=True)
+    pipe.sadd(key, LOADED_MARKER)
+    for start in range(0, len(holders), LOAD_CHUNK_SIZE):
+        pipe.sadd(key, *holders[start:start + LOAD_CHUNK_SIZE])
+    pipe.expire(key, current_app.config['SEAT_COUNTER_TTL'])
+    pipe.execute()
+
+def reserve_seat(event_id, student_id, capacity):
+    redis_client = get_redis_client()
+    reserve = redis_client.register_script(RESERVE_SEAT_SCRIPT)
+
+    result = reserve(keys=[_seats_key(event_id)], args=[student_id, capacity])
+    if result == SEAT_COUNTER_MISSING:
+        load_seat_holders(redis_client, event_id)
+        result = reserve(keys=[_seats_key(event_id)], args=[student_id, capacity])
+    return result
+
+def reserve_seat_in_db(event_id, student_id, capacity):
+    db.session.query(Event.id).filter(Event.id == event_id).with_for_update().first()
+
+    existing = db.session.query(Participant.id).filter_by(event_id=event_id, student_id=student_id).first()
+    if existing:
+        return SEAT_HELD
+
+    taken = db.session.query(func.count(Participant.id)).filter(Participant.event_id == event_id).scalar()
+    return SEAT_RESERVED if taken < capacity else SEAT_FULL
+
+def seats_taken(event_id):
+    redis_client = get_redis_client()
+    key = _seats_key(event_id)
+
+    if not redis_client.exists(key):
+        load_seat_holders(redis_client, event_id)
+    return max(redis_client.scard(key) - 1, 0)
+
+def release_seat(event_id, student_id):
+    try:
+        get_redis_client().srem(_seats_key(event_id), student_id)
+    except RedisError as e:
+        current_app.logger.warning(f"Could not release seat for {event_id}: {str(e)}")
+
+def reset_seat_counter(event_id):
+    try:
+        get_redis_client().delete(_seats_key(event_id))
+    except RedisError as e:
+        current_app.logger.warning(f"Could not reset seat counter for {event_id}: {str(e)}")
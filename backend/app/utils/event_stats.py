@@ -0,0 +1,78 @@
+import datetime
+from sqlalchemy import case, func
+from app.models.database import db, Event, Participant
+
+BREAKDOWN_COLUMNS = ['department', 'academic_year', 'college_code']
+TIMELINE_INTERVALS = ['day', 'hour']
+
+def _attended_sum():
+    return func.sum(case((Participant.attended.is_(True), 1), else_=0))
+
+def _time_bucket(column, interval):
+    if db.engine.dialect.name == 'postgresql':
+        return func.date_trunc(interval, column)
+    return func.strftime('%Y-%m-%d' if interval == 'day' else '%Y-%m-%d %H:00:00', column)
+
+def _format_bucket(value):
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+def _scoped(query, event_id):
+    if event_id is not None:
+        query = query.filter(Participant.event_id == event_id)
+    return query
+
+def _totals(event_id=None):
+    registered, attended = _scoped(db.session.query(func.count(Participant.id), _attended_sum()), event_id).one()
+    return {'registered': registered, 'attended': int(attended or 0)}
+
+def _breakdown(column_name, event_id=None):
+    column = getattr(Participant, column_name)
+    registered = func.count(Participant.id)
+    query = _scoped(db.session.query(column, registered, _attended_sum()), event_id)
+    query = query.group_by(column).order_by(registered.desc(), column)
+    return [
+        {'value': value, 'registered': count, 'attended': int(attended or 0)}
+        for value, count, attended in query
+    ]
+
+def _timeline(interval, event_id=None):
+    bucket = _time_bucket(Participant.created_at, interval)
+    query = _scoped(db.session.query(bucket.label('bucket'), func.count(Participant.id), _attended_sum()), event_id)
+    query = query.filter(Participant.created_at.isnot(None)).group_by(bucket).order_by(bucket)
+    return [
+        {'bucket': _format_bucket(value), 'registered': count, 'attended': int(attended or 0)}
+        for value, count, attended in query
+    ]
+
+def _breakdowns(event_id=None):
+    return {f"by_{column}": _breakdown(column, event_id) for column in BREAKDOWN_COLUMNS}
+
+def compute_event_stats(event_id, interval='day'):
+    return {
+        'event_id': event_id,
+        **_totals(event_id),
+        **_breakdowns(event_id),
+        'interval': interval,
+        'registrations_over_time': _timeline(interval, event_id),
+    }
+
+def compute_overall_stats(interval='day'):
+    events = Event.query_with_counts().order_by(Event.event_date.desc()).all()
+    return {
+        **_totals(),
+        'events': [
+            {
+                'event_id': event.id,
+                'name': event.name,
+                'event_date': event.event_date,
+                'registered': registered,
+                'attended': int(attended or 0),
+            }
+            for event, registered, attended in events
+        ],
+        **_breakdowns(),
+        'interval': interval,
+        'registrations_over_time': _timeline(interval),
+    }
@@ -0,0 +1,82 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from flask import current_app
+
+VARIANT_WIDTHS = (320, 640, 960, 1280, 1920)
+CLOUDINARY_TRANSFORMATION = 'c_limit,w_{width},f_auto,q_auto'
+LOCAL_UPLOADS_PATH = '/api/uploads/'
+LOCAL_VARIANTS_DIR = 'variants'
+LOCAL_VARIANT_FORMAT = 'webp'
+LOCAL_VARIANT_QUALITY = 80
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def local_variant_name(filename, width):
+    return f"{filename.rsplit('.', 1)[0]}-{width}w.{LOCAL_VARIANT_FORMAT}"
+
+def cloudinary_variant_url(url, width):
+    base, _, rest = url.partition('/upload/')
+    return f"{base}/upload/{CLOUDINARY_TRANSFORMATION.format(width=width)}/{rest}"
+
+@lru_cache(maxsize=4096)
+def image_variants(url):
+    if not url:
+        return ()
+    if 'res.cloudinary.com' in url and '/image/upload/' in url:
+        return tuple((width, cloudinary_variant_url(url, width)) for width in VARIANT_WIDTHS)
+    if url.startswith(LOCAL_UPLOADS_PATH) and '/' not in url[len(LOCAL_UPLOADS_PATH):]:
+        filename = url[len(LOCAL_UPLOADS_PATH):]
+        return tuple(
+            (width, f"{LOCAL_UPLOADS_PATH}{LOCAL_VARIANTS_DIR}/{local_variant_name(filename, width)}")
+            for width in VARIANT_WIDTHS
+        )
+    return ()
+
+def responsive_image(url):
+    variants = image_variants(url)
+    return {
+        'variants': [{'width': width, 'url': variant_url} for width, variant_url in variants],
+        'srcset': ', '.join(f"{variant_url} {width}w" for width, variant_url in variants) or None,
+    }
+
+def generate_local_variants(path):
+    from PIL import Image, ImageOps
+
+    directory, filename = os.path.split(path)
+    variants_dir = os.path.join(directory, LOCAL_VARIANTS_DIR)
+    os.makedirs(variants_dir, exist_ok=True)
+
+    with Image.open(path) as original:
+        image = ImageOps.exif_transpose(original)
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+        for width in VARIANT_WIDTHS:
+            variant = image.copy()
+            variant.thumbnail((width, width * 10))
+            variant.save(
+                os.path.join(variants_dir, local_variant_name(filename, width)),
+                LOCAL_VARIANT_FORMAT,
+                quality=LOCAL_VARIANT_QUALITY
+            )
+
+def schedule_local_variants(path):
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=current_app.config['IMAGE_VARIANT_WORKERS'],
+                thread_name_prefix='image-variants'
+            )
+
+    logger = current_app.logger
+
+    def generate():
+        try:
+            generate_local_variants(path)
+        except Exception as e:
+            logger.error(f"Could not generate image variants for {path}: {str(e)}")
+
+    return _executor.submit(generate)
@@ -0,0 +1,340 @@
+import codecs
+import csv
+import datetime
+import io
+import tempfile
+from sqlalchemy import func, or_, select, tuple_, update
+from flask import current_app
+from sqlalchemy.exc import DataError, IntegrityError
+from app.models.database import db, Event, Participant
+from app.utils.cache_utils import TTLCache, MISSING
+from app.utils.db_utils import dialect_insert
+from app.utils.event_cache import invalidate_event_cache
+from app.utils.event_capacity import reset_seat_counter
+
+REQUIRED_FIELDS = ['name', 'email', 'department', 'academic_year', 'college_code', 'student_id']
+OPTIONAL_FIELDS = ['phone']
+UPDATABLE_FIELDS = ['name', 'email', 'phone', 'department', 'academic_year', 'college_code']
+EXPORT_COLUMNS = [
+    'name', 'email', 'phone', 'department', 'academic_year', 'college_code',
+    'student_id', 'participant_id', 'attended', 'created_at'
+]
+EXPORT_FETCH_SIZE = 1000
+CSV_FALLBACK_ENCODING = 'cp1252'
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+SORT_FIELDS = ['name', 'created_at', 'attended']
+SEARCH_FIELDS = ['name', 'email', 'student_id']
+MAX_PARTICIPANT_PAGE_SIZE = 200
+
+event_status_cache = TTLCache(maxsize=256)
+
+def normalize_header(header):
+    return str(header or '').strip().lower().replace(' ', '_').replace('-', '_')
+
+def normalize_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+def validate_participant(data):
+    for field in REQUIRED_FIELDS:
+        if field not in data or not data[field]:
+            return None, f"{field.replace('_', ' ').title()} is required"
+
+    participant = {field: normalize_cell(data[field]) for field in REQUIRED_FIELDS}
+    participant['phone'] = normalize_cell(data.get('phone'))
+
+    email = participant['email']
+    if '@' not in email or '.' not in email:
+        return None, "Invalid email format"
+
+    for field in REQUIRED_FIELDS + OPTIONAL_FIELDS:
+        max_length = Participant.__table__.c[field].type.length
+        if max_length and len(participant[field]) > max_length:
+            return None, f"{field.replace('_', ' ').title()} is too long (max {max_length} characters)"
+
+    return participant, None
+
+def participant_upsert_statement():
+    stmt = dialect_insert(Participant.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=['student_id', 'event_id'],
+        set_={field: stmt.excluded[field] for field in UPDATABLE_FIELDS}
+    )
+
+def upsert_participants(rows):
+    if not rows:
+        return
+    now = datetime.datetime.utcnow()
+    params = [{**row, 'created_at': row.get('created_at') or now} for row in rows]
+    db.session.execute(participant_upsert_statement(), params)
+
+def register_participant_row(participant):
+    now = datetime.datetime.utcnow()
+    stmt = participant_upsert_statement().returning(*Participant.__table__.c)
+    row = db.session.execute(stmt, {**participant, 'created_at': now}).one()
+    return dict(row._mapping), row.created_at == now
+
+def get_registration_settings(event_id):
+    settings = event_status_cache.get(event_id)
+    if settings is MISSING:
+        event = db.session.query(
+            Event.accepting_submissions, Event.surge_mode, Event.capacity
+        ).filter(Event.id == event_id).first()
+        settings = None if event is None else {
+            'accepting_submissions': bool(event.accepting_submissions),
+            'surge_mode': bool(event.surge_mode),
+            'capacity': event.capacity,
+        }
+        event_status_cache.set(event_id, settings, current_app.config['EVENT_STATUS_CACHE_TTL'])
+    return settings
+
+def invalidate_registration_status(event_id):
+    event_status_cache.pop(event_id)
+
+def detect_csv_encoding(stream, chunk_size=65536):
+    if not stream.seekable():
+        return 'utf-8-sig'
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    try:
+        for chunk in iter(lambda: stream.read(chunk_size), b''):
+            decoder.decode(chunk)
+        decoder.decode(b'', final=True)
+        return 'utf-8-sig'
+    except UnicodeDecodeError:
+        # Excel saves "CSV" as Windows-1252 unless UTF-8 is picked explicitly
+        return CSV_FALLBACK_ENCODING
+    finally:
+        stream.seek(0)
+
+def iter_csv_rows(stream):
+    reader = csv.reader(codecs.iterdecode(stream, detect_csv_encoding(stream)))
+    header = next(reader, None)
+    if header is None:
+        return
+    keys = [normalize_header(column) for column in header]
+    for line_number, values in enumerate(reader, start=2):
+        if not any(value.strip() for value in values):
+            continue
+        yield line_number, {key: normalize_cell(value) for key, value in zip(keys, values) if key}
+
+def iter_xlsx_rows(stream):
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        keys = [normalize_header(column) for column in header]
+        for line_number, values in enumerate(rows, start=2):
+            if all(value is None or normalize_cell(value) == '' for value in values):
+                continue
+            yield line_number, {key: normalize_cell(value) for key, value in zip(keys, values) if key}
+    finally:
+        workbook.close()
+
+def iter_import_rows(stream, filename):
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension == 'csv':
+        return iter_csv_rows(stream)
+    if extension == 'xlsx':
+        return iter_xlsx_rows(stream)
+    raise ValueError("Unsupported file type, expected .csv or .xlsx")
+
+def flush_participant_batch(batch, summary):
+    rows = list(batch.values())
+    try:
+        upsert_participants([row for _, row in rows])
+        db.session.commit()
+        summary['imported'] += len(rows)
+        return
+    except (IntegrityError, DataError):
+        db.session.rollback()
+
+    for line_number, row in rows:
+        try:
+            upsert_participants([row])
+            db.session.commit()
+            summary['imported'] += 1
+        except (IntegrityError, DataError) as e:
+            db.session.rollback()
+            summary['errors'].append({'row': line_number, 'error': str(e.orig) if getattr(e, 'orig', None) else str(e)})
+
+def import_participants(event_id, rows, batch_size=500):
+    summary = {'imported': 0, 'duplicates': 0, 'errors': []}
+    batch = {}
+    line_number = 1
+
+    try:
+        try:
+            for line_number, data in rows:
+                participant, error = validate_participant(data)
+                if error:
+                    summary['errors'].append({'row': line_number, 'error': error})
+                    continue
+
+                participant['event_id'] = event_id
+                if participant['student_id'] in batch:
+                    summary['duplicates'] += 1
+                batch[participant['student_id']] = (line_number, participant)
+
+                if len(batch) >= batch_size:
+                    flush_participant_batch(batch, summary)
+                    batch = {}
+        except UnicodeDecodeError as e:
+            summary['errors'].append({
+                'row': line_number + 1,
+                'error': f"Could not decode the file from this row on ({e.reason}), save it as UTF-8 CSV"
+            })
+
+        if batch:
+            flush_participant_batch(batch, summary)
+    finally:
+        if summary['imported']:
+            invalidate_event_cache(event_id)
+            reset_seat_counter(event_id)
+
+    summary['failed'] = len(summary['errors'])
+    return summary
+
+def parse_student_identifier(identifier):
+    if isinstance(identifier, dict):
+        college_code, student_id = identifier.get('college_code'), identifier.get('student_id')
+    elif isinstance(identifier, str) and '+' in identifier:
+        college_code, student_id = identifier.split('+', 1)
+    else:
+        raise ValueError(f"Invalid student identifier: {identifier}")
+
+    if not college_code or not student_id:
+        raise ValueError(f"Invalid student identifier: {identifier}")
+    return str(college_code).strip(), str(student_id).strip()
+
+def mark_attendance(event_id, attended, participant_ids=(), students=()):
+    participant_ids = set(participant_ids)
+    students = set(students)
+    table = Participant.__table__
+
+    conditions = []
+    if participant_ids:
+        conditions.append(table.c.id.in_(participant_ids))
+    if students:
+        conditions.append(tuple_(table.c.college_code, table.c.student_id).in_(students))
+    if not conditions:
+        return set(), set(), set()
+
+    where = (table.c.event_id == event_id) & or_(*conditions)
+    columns = (table.c.id, table.c.college_code, table.c.student_id)
+
+    if db.engine.dialect.update_returning:
+        matched = db.session.execute(
+            update(table).where(where).values(attended=attended).returning(*columns)
+        ).all()
+    else:
+        matched = db.session.execute(select(*columns).where(where)).all()
+        db.session.execute(update(table).where(where).values(attended=attended))
+
+    matched_ids = {row.id for row in matched}
+    matched_students = {(row.college_code, row.student_id) for row in matched}
+    return matched_ids, participant_ids - matched_ids, students - matched_students
+
+def escape_like(value, escape='\\'):
+    return value.replace(escape, escape * 2).replace('%', escape + '%').replace('_', escape + '_')
+
+def participant_list_query(event_id, sort='created_at', order='asc', department=None, academic_year=None, attended=None, search=None):
+    query = Participant.query.filter(Participant.event_id == event_id)
+
+    if department:
+        query = query.filter(Participant.department == department)
+    if academic_year:
+        query = query.filter(Participant.academic_year == academic_year)
+    if attended is True:
+        query = query.filter(Participant.attended.is_(True))
+    elif attended is False:
+        query = query.filter(or_(Participant.attended.is_(False), Participant.attended.is_(None)))
+
+    if search:
+        pattern = escape_like(search.strip().lower()) + '%'
+        query = query.filter(or_(*[
+            func.lower(getattr(Participant, field)).like(pattern, escape='\\') for field in SEARCH_FIELDS
+        ]))
+
+    sort_column = func.lower(Participant.name) if sort == 'name' else getattr(Participant, sort)
+    if order == 'desc':
+        return query.order_by(sort_column.desc(), Participant.id.desc())
+    return query.order_by(sort_column.asc(), Participant.id.asc())
+
+def parse_export_columns(value):
+    if not value:
+        return list(EXPORT_COLUMNS)
+    columns = [column.strip() for column in value.split(',') if column.strip()]
+    unknown = [column for column in columns if column not in EXPORT_COLUMNS]
+    if unknown or not columns:
+        raise ValueError(f"Unknown export columns: {', '.join(unknown) or value}")
+    return columns
+
+def iter_participant_export_rows(event_id, columns, filter_type='all'):
+    table = Participant.__table__
+    needed = {'college_code', 'student_id'} if 'participant_id' in columns else set()
+    needed.update(column for column in columns if column != 'participant_id')
+
+    query = select(*[table.c[column] for column in sorted(needed)]).where(table.c.event_id == event_id)
+    if filter_type == 'attended':
+        query = query.where(table.c.attended.is_(True))
+    elif filter_type == 'absent':
+        query = query.where(or_(table.c.attended.is_(False), table.c.attended.is_(None)))
+    query = query.order_by(table.c.id)
+
+    result = db.session.execute(query.execution_options(stream_results=True, yield_per=EXPORT_FETCH_SIZE))
+    try:
+        for row in result:
+            values = row._mapping
+            yield [
+                f"{values['college_code']}{values['student_id']}" if column == 'participant_id' else values[column]
+                for column in columns
+            ]
+    finally:
+        result.close()
+
+def format_export_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'Yes' if value else 'No'
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        # Registration data is public input; keep spreadsheets from evaluating it
+        return "'" + value
+    return value
+
+def generate_participants_csv(event_id, columns, filter_type='all', chunk_rows=500):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+
+    for count, row in enumerate(iter_participant_export_rows(event_id, columns, filter_type), start=1):
+        writer.writerow([format_export_value(value) for value in row])
+        if count % chunk_rows == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    yield buffer.getvalue()
+
+def write_participants_xlsx(event_id, columns, filter_type='all'):
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet('Participants')
+    sheet.append(columns)
+    for row in iter_participant_export_rows(event_id, columns, filter_type):
+        sheet.append([format_export_value(value) for value in row])
+
+    output = tempfile.TemporaryFile()
+    workbook.save(output)
+    output.seek(0)
+    return output
@@ -0,0 +1,32 @@
+from flask import current_app, jsonify, request
+from flask_limiter import Limiter
+from flask_limiter.util import get_remote_address
+
+limiter = Limiter(key_func=get_remote_address)
+
+def global_bucket():
+    return 'global'
+
+def registration_key():
+    # Students often register from one campus NAT address, so limit each student
+    # per address and leave flood protection to the global bucket.
+    data = request.get_json(silent=True)
+    student_id = data.get('student_id') if isinstance(data, dict) else None
+    return f"{get_remote_address()}:{str(student_id or '').strip().lower()}"
+
+def config_limit(key):
+    return lambda: current_app.config[key]
+
+def rate_limit(name, key_func=None):
+    def decorator(view):
+        view = limiter.limit(config_limit(f'RATELIMIT_{name}'), key_func=key_func)(view)
+        view = limiter.limit(config_limit(f'RATELIMIT_{name}_GLOBAL'), key_func=global_bucket)(view)
+        return view
+    return decorator
+
+def init_rate_limiter(app):
+    limiter.init_app(app)
+
+    @app.errorhandler(429)
+    def rate_limit_exceeded(e):
+        return jsonify({"error": "Too many requests. Please try again later."}), 429
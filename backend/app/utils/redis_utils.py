@@ -1,12 +1,29 @@
 import os
 from redis import Redis
+from redis.backoff import NoBackoff
+from redis.retry import Retry
 
-redis_client = Redis(
+REDIS_SETTINGS = dict(
     host=os.environ.get('REDIS_HOST', 'localhost'),
     port=int(os.environ.get('REDIS_PORT', 6379)),
     password=os.environ.get('REDIS_PASSWORD', None),
     ssl=os.environ.get('REDIS_SSL', 'False').lower() == 'true'
 )
+CACHE_TIMEOUT = float(os.environ.get('REDIS_CACHE_TIMEOUT', 0.25))
+
+redis_client = Redis(**REDIS_SETTINGS)
+
+# Caches are optional: fail fast and fall back to the database rather than
+# letting a Redis outage stall public reads behind connect retries.
+cache_client = Redis(
+    **REDIS_SETTINGS,
+    socket_connect_timeout=CACHE_TIMEOUT,
+    socket_timeout=CACHE_TIMEOUT,
+    retry=Retry(NoBackoff(), 0)
+)
 
 def get_redis_client():
-    return redis_client
\ No newline at end of file
+    return redis_client
+
+def get_cache_client():
+    return cache_client
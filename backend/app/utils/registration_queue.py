@@ -0,0 +1,156 @@
+import datetime
+import json
+import os
+import socket
+import time
+import uuid
+from flask import current_app
+from redis.exceptions import ResponseError
+from sqlalchemy.exc import SQLAlchemyError
+from app.models.database import db
+from app.utils.redis_utils import get_redis_client
+from app.utils.participant_utils import flush_participant_batch
+from app.utils.event_cache import invalidate_event_cache
+from app.utils.event_capacity import reset_seat_counter
+
+CONSUMER_GROUP = 'registration-writers'
+
+RELEASE_PENDING_SCRIPT = """
+if redis.call('HGET', KEYS[1], ARGV[1]) == ARGV[2] then
+    return redis.call('HDEL', KEYS[1], ARGV[1])
+end
+return 0
+"""
+
+def pending_key(event_id):
+    return f"registrations:pending:{event_id}"
+
+def _receipt_key(receipt_id):
+    return f"registrations:receipt:{receipt_id}"
+
+def _set_receipt(client, receipt_id, receipt):
+    client.set(_receipt_key(receipt_id), json.dumps(receipt), ex=current_app.config['REGISTRATION_RECEIPT_TTL'])
+
+def enqueue_registration(participant):
+    event_id = participant['event_id']
+    student_id = participant['student_id']
+    receipt_id = uuid.uuid4().hex
+    payload = json.dumps({**participant, 'created_at': datetime.datetime.utcnow().isoformat()})
+
+    pipe = get_redis_client().pipeline(transaction=True)
+    pipe.hset(pending_key(event_id), student_id, payload)
+    _set_receipt(pipe, receipt_id, {'status': 'queued', 'event_id': event_id, 'student_id': student_id})
+    pipe.xadd(current_app.config['REGISTRATION_STREAM_KEY'], {
+        'event_id': event_id,
+        'student_id': student_id,
+        'receipt_id': receipt_id,
+    })
+    pipe.execute()
+    return receipt_id
+
+def get_registration_receipt(receipt_id):
+    raw = get_redis_client().get(_receipt_key(receipt_id))
+    return json.loads(raw) if raw else None
+
+def flush_registrations(entries):
+    redis_client = get_redis_client()
+    release_pending = redis_client.register_script(RELEASE_PENDING_SCRIPT)
+
+    by_event = {}
+    for _, fields in entries:
+        if not fields:
+            continue
+        event_id = fields[b'event_id'].decode('utf-8')
+        student_id = fields[b'student_id'].decode('utf-8')
+        receipt_id = fields[b'receipt_id'].decode('utf-8')
+        by_event.setdefault(event_id, {}).setdefault(student_id, []).append(receipt_id)
+
+    persisted = 0
+    for event_id, students in by_event.items():
+        student_ids = list(students)
+        payloads = redis_client.hmget(pending_key(event_id), student_ids)
+
+        batch = {}
+        for student_id, raw in zip(student_ids, payloads):
+            if raw is None:
+                continue
+            row = json.loads(raw)
+            row['created_at'] = datetime.datetime.fromisoformat(row['created_at'])
+            batch[student_id] = (student_id, row)
+
+        summary = {'imported': 0, 'errors': []}
+        if batch:
+            flush_participant_batch(batch, summary)
+            invalidate_event_cache(event_id)
+        persisted += summary['imported']
+        errors = {error['row']: error['error'] for error in summary['errors']}
+        if errors:
+            reset_seat_counter(event_id)
+
+        pipe = redis_client.pipeline(transaction=False)
+        for student_id, raw in zip(student_ids, payloads):
+            if raw is not None:
+                release_pending(keys=[pending_key(event_id)], args=[student_id, raw], client=pipe)
+            for receipt_id in students[student_id]:
+                receipt = {'status': 'persisted', 'event_id': event_id, 'student_id': student_id}
+                if student_id in errors:
+                    receipt.update(status='failed', error=errors[student_id])
+                _set_receipt(pipe, receipt_id, receipt)
+        pipe.execute()
+
+    return persisted
+
+def ensure_consumer_group(redis_client, stream_key):
+    try:
+        redis_client.xgroup_create(stream_key, CONSUMER_GROUP, id='0', mkstream=True)
+    except ResponseError as e:
+        if 'BUSYGROUP' not in str(e):
+            raise
+
+def run_registration_worker(once=False, consumer=None):
+    config = current_app.config
+    stream_key = config['REGISTRATION_STREAM_KEY']
+    batch_size = config['REGISTRATION_WORKER_BATCH_SIZE']
+    consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+
+    redis_client = get_redis_client()
+    ensure_consumer_group(redis_client, stream_key)
+
+    try:
+        redis_client.xautoclaim(
+            stream_key, CONSUMER_GROUP, consumer,
+            min_idle_time=config['REGISTRATION_WORKER_CLAIM_IDLE_MS'], start_id='0-0', count=batch_size
+        )
+    except ResponseError as e:
+        current_app.logger.warning(f"Could not claim stale registrations: {str(e)}")
+
+    last_id = '0'
+    total = 0
+    while True:
+        block = None if once or last_id == '0' else config['REGISTRATION_WORKER_BLOCK_MS']
+        response = redis_client.xreadgroup(CONSUMER_GROUP, consumer, {stream_key: last_id}, count=batch_size, block=block)
+        entries = response[0][1] if response else []
+
+        if not entries:
+            if last_id == '0':
+                last_id = '>'
+                continue
+            if once:
+                return total
+            continue
+
+        try:
+            total += flush_registrations(entries)
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            current_app.logger.error(f"Registration flush failed, will retry: {str(e)}")
+            if once:
+                raise
+            time.sleep(1)
+            last_id = '0'
+            continue
+
+        entry_ids = [entry_id for entry_id, _ in entries]
+        redis_client.xack(stream_key, CONSUMER_GROUP, *entry_ids)
+        redis_client.xdel(stream_key, *entry_ids)
+        current_app.logger.info(f"Flushed {len(entry_ids)} queued registrations")
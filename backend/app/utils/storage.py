@@ -0,0 +1,304 @@
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import cloudinary
+import cloudinary.api
+import cloudinary.uploader
+import cloudinary.utils
+import urllib3
+from cloudinary.api_client import call_api as cloudinary_call_api
+from cloudinary.api_client.tcp_keep_alive_manager import TCPKeepAlivePoolManager
+from flask import current_app
+from itsdangerous import BadSignature, URLSafeTimedSerializer
+from app.utils.asset_registry import (
+    record_uploaded_asset, forget_uploaded_assets, resolve_public_ids, UPLOADS_PREFIX
+)
+from app.utils.cloudinary_utils import allowed_file
+
+DELETE_BATCH_SIZE = 100
+DIRECT_UPLOAD_FORMATS = 'png,jpg,jpeg,gif'
+REQUIRED_SETTINGS = ['CLOUDINARY_CLOUD_NAME', 'CLOUDINARY_API_KEY', 'CLOUDINARY_API_SECRET']
+
+def metadata_tags(metadata):
+    tags = []
+    for key, value in metadata.items():
+        if isinstance(value, bool) and value:
+            tags.append(key)
+        elif not isinstance(value, bool):
+            tags.append(f"{key}_{value}")
+    return tags
+
+class LatencyMetrics:
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, operation, elapsed, ok=True):
+        with self._lock:
+            stats = self._stats.setdefault(operation, {'calls': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            elapsed_ms = elapsed * 1000
+            stats['calls'] += 1
+            stats['total_ms'] += elapsed_ms
+            stats['max_ms'] = max(stats['max_ms'], elapsed_ms)
+            if not ok:
+                stats['errors'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                operation: {
+                    'calls': stats['calls'],
+                    'errors': stats['errors'],
+                    'avg_ms': round(stats['total_ms'] / stats['calls'], 2),
+                    'max_ms': round(stats['max_ms'], 2),
+                }
+                for operation, stats in self._stats.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+class CloudinaryStorage:
+    def __init__(self, app=None):
+        self.enabled = False
+        self.http = None
+        self.executor = None
+        self.metrics = LatencyMetrics()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.extensions['storage'] = self
+        config = app.config
+        missing = [key for key in REQUIRED_SETTINGS if not config.get(key)]
+
+        if len(missing) == len(REQUIRED_SETTINGS):
+            self.enabled = False
+            app.logger.warning("Cloudinary is not configured - image uploads will not work")
+            return
+        if missing:
+            raise RuntimeError(f"Incomplete Cloudinary configuration, missing: {', '.join(missing)}")
+
+        cloudinary.config(
+            cloud_name=config['CLOUDINARY_CLOUD_NAME'],
+            api_key=config['CLOUDINARY_API_KEY'],
+            api_secret=config['CLOUDINARY_API_SECRET'],
+            secure=True
+        )
+
+        # The SDK builds its own unbounded connection pools at import time, so swap in
+        # a single keep-alive pool with a fixed size and timeouts for uploads and API calls.
+        self.http = TCPKeepAlivePoolManager(
+            num_pools=4,
+            maxsize=config['CLOUDINARY_POOL_MAXSIZE'],
+            block=True,
+            timeout=urllib3.Timeout(connect=config['CLOUDINARY_CONNECT_TIMEOUT'], read=config['CLOUDINARY_READ_TIMEOUT']),
+            **cloudinary.CERT_KWARGS
+        )
+        cloudinary.uploader._http = self.http
+        cloudinary_call_api._http = self.http
+        self.executor = ThreadPoolExecutor(
+            max_workers=config['CLOUDINARY_UPLOAD_WORKERS'],
+            thread_name_prefix='cloudinary-upload'
+        )
+
+        self.enabled = True
+        app.logger.info("Cloudinary configured for image uploads")
+
+    def _call(self, operation, func, *args, **kwargs):
+        started = time.perf_counter()
+        ok = False
+        try:
+            result = func(*args, **kwargs)
+            ok = True
+            return result
+        finally:
+            elapsed = time.perf_counter() - started
+            self.metrics.record(operation, elapsed, ok)
+            current_app.logger.debug(f"Cloudinary {operation} took {elapsed * 1000:.1f}ms")
+
+    def upload(self, file, **options):
+        return self._call('upload', cloudinary.uploader.upload, file, **options)
+
+    def destroy(self, public_id):
+        return self._call('destroy', cloudinary.uploader.destroy, public_id)
+
+    def delete_resources(self, public_ids):
+        return self._call('delete_resources', cloudinary.api.delete_resources, public_ids)
+
+    def replace_tag(self, tags, public_ids):
+        return self._call('replace_tag', cloudinary.uploader.replace_tag, tags, public_ids)
+
+    def remove_all_tags(self, public_ids):
+        return self._call('remove_all_tags', cloudinary.uploader.remove_all_tags, public_ids)
+
+    def resources(self, **params):
+        return self._call('resources', cloudinary.api.resources, **params)
+
+    def iter_resources(self, prefix=UPLOADS_PREFIX, page_size=500):
+        cursor = None
+        while True:
+            params = {'type': 'upload', 'prefix': prefix, 'max_results': page_size}
+            if cursor:
+                params['next_cursor'] = cursor
+            result = self.resources(**params)
+            yield result.get('resources', [])
+            cursor = result.get('next_cursor')
+            if not cursor:
+                return
+
+    def upload_images(self, files, **options):
+        app = current_app._get_current_object()
+
+        def upload_one(file):
+            with app.app_context():
+                return self.upload(
+                    file,
+                    public_id=f"{UPLOADS_PREFIX}/{uuid.uuid4().hex}",
+                    folder=UPLOADS_PREFIX,
+                    resource_type="auto",
+                    **options
+                )
+
+        futures = [self.executor.submit(upload_one, file) for file in files]
+        results = []
+        for file, future in zip(files, futures):
+            try:
+                results.append((file, future.result(), None))
+            except Exception as e:
+                current_app.logger.error(f"Cloudinary upload error for {file.filename}: {str(e)}")
+                results.append((file, None, str(e)))
+        return results
+
+    def upload_token_serializer(self):
+        return URLSafeTimedSerializer(current_app.config['SECRET_KEY'], salt='direct-upload')
+
+    def sign_upload(self, featured=False):
+        # The browser posts the file straight to Cloudinary with these parameters, so the
+        # public_id is fixed here and the upload token ties the later confirm call to it.
+        public_id = f"{UPLOADS_PREFIX}/{uuid.uuid4().hex}"
+        params = {
+            'public_id': public_id,
+            'allowed_formats': DIRECT_UPLOAD_FORMATS,
+            'timestamp': int(time.time()),
+        }
+        if featured:
+            params['tags'] = 'featured'
+
+        config = cloudinary.config()
+        params['signature'] = cloudinary.utils.api_sign_request(params, config.api_secret)
+        params['api_key'] = config.api_key
+        return {
+            'upload_url': cloudinary.utils.cloudinary_api_url('upload', resource_type='image'),
+            'params': params,
+            'upload_token': self.upload_token_serializer().dumps({'public_id': public_id, 'featured': featured}),
+            'expires_in': current_app.config['DIRECT_UPLOAD_TTL'],
+        }
+
+    def load_upload_token(self, token):
+        try:
+            return self.upload_token_serializer().loads(token, max_age=current_app.config['DIRECT_UPLOAD_TTL'])
+        except BadSignature:
+            return None
+
+    def verified_upload(self, result):
+        # The response signature only covers public_id and version, so the stored
+        # asset is rebuilt from those instead of the client-posted URL and metadata.
+        try:
+            public_id, version = result['public_id'], result['version']
+            if not cloudinary.utils.verify_api_response_signature(public_id, version, result['signature']):
+                return None
+        except (KeyError, TypeError):
+            return None
+
+        file_format = str(result.get('format') or '').lower()
+        if file_format not in DIRECT_UPLOAD_FORMATS.split(','):
+            file_format = None
+        return {
+            'public_id': public_id,
+            'secure_url': cloudinary.CloudinaryImage(public_id).build_url(version=version, format=file_format, secure=True),
+            'resource_type': 'image',
+            'format': file_format,
+        }
+
+    def save_image(self, file):
+        if not file or not allowed_file(file.filename):
+            return None
+
+        if not self.enabled:
+            current_app.logger.error("Cannot upload - Cloudinary not configured")
+            return None
+
+        try:
+            result = self.upload(
+                file,
+                public_id=f"{UPLOADS_PREFIX}/{uuid.uuid4().hex}",
+                folder=UPLOADS_PREFIX,
+                resource_type="auto"
+            )
+
+            current_app.logger.info(f"File uploaded to Cloudinary: {result['secure_url']}")
+            record_uploaded_asset(result)
+            return result['secure_url']
+        except Exception as e:
+            current_app.logger.error(f"Cloudinary upload error: {str(e)}")
+            return None
+
+    def delete_file(self, public_id):
+        if not self.enabled:
+            current_app.logger.error("Cannot delete - Cloudinary not configured")
+            return False
+
+        try:
+            result = self.destroy(public_id)
+            success = result.get('result') == 'ok'
+            if success:
+                current_app.logger.info(f"Successfully deleted {public_id} from Cloudinary")
+                forget_uploaded_assets([public_id])
+            else:
+                current_app.logger.warning(f"Cloudinary reported non-OK result: {result}")
+            return success
+        except Exception as e:
+            current_app.logger.error(f"Cloudinary delete error: {str(e)}")
+            return False
+
+    def delete_files(self, identifiers):
+        summary = {'deleted': [], 'not_found': [], 'failed': []}
+
+        if not self.enabled:
+            current_app.logger.error("Cannot delete - Cloudinary not configured")
+            summary['failed'] = list(identifiers)
+            return summary
+
+        resolved = resolve_public_ids(identifiers)
+        summary['not_found'] = [identifier for identifier, public_id in resolved.items() if not public_id]
+        public_ids = list(dict.fromkeys(public_id for public_id in resolved.values() if public_id))
+        stale = []
+
+        for start in range(0, len(public_ids), DELETE_BATCH_SIZE):
+            chunk = public_ids[start:start + DELETE_BATCH_SIZE]
+            try:
+                result = self.delete_resources(chunk)
+            except Exception as e:
+                current_app.logger.error(f"Cloudinary bulk delete error: {str(e)}")
+                summary['failed'].extend(chunk)
+                continue
+
+            deleted = result.get('deleted', {})
+            for public_id in chunk:
+                status = deleted.get(public_id)
+                if status == 'deleted':
+                    summary['deleted'].append(public_id)
+                elif status == 'not_found':
+                    summary['not_found'].append(public_id)
+                    stale.append(public_id)
+                else:
+                    summary['failed'].append(public_id)
+
+        forget_uploaded_assets(summary['deleted'] + stale)
+        current_app.logger.info(f"Deleted {len(summary['deleted'])} files from Cloudinary")
+        return summary
+
+storage = CloudinaryStorage()
@@ -0,0 +1,151 @@
+import datetime
+import json
+import time
+from flask import current_app
+from sqlalchemy import and_, delete, func, insert, or_
+from sqlalchemy.exc import SQLAlchemyError
+from app.models.database import db, StorageOutbox, UploadedAsset
+from app.utils.asset_registry import normalize_public_id
+from app.utils.storage import storage, metadata_tags, DELETE_BATCH_SIZE
+
+OPERATION_TAGS = 'tags'
+OPERATION_DELETE = 'delete'
+TAG_BATCH_SIZE = 1000
+
+def enqueue_changes(operation, public_ids, tags=None):
+    if not storage.enabled or not public_ids:
+        return False
+    now = datetime.datetime.utcnow()
+    db.session.execute(insert(StorageOutbox), [
+        {'operation': operation, 'public_id': normalize_public_id(public_id), 'tags': tags, 'available_at': now, 'created_at': now}
+        for public_id in public_ids
+    ])
+    return True
+
+def enqueue_metadata_updates(public_ids, metadata):
+    return enqueue_changes(OPERATION_TAGS, public_ids, json.dumps(metadata_tags(metadata)))
+
+def enqueue_deletes(public_ids):
+    return enqueue_changes(OPERATION_DELETE, public_ids)
+
+def enqueue_metadata_update(public_id, metadata):
+    return enqueue_metadata_updates([public_id], metadata)
+
+def enqueue_delete(public_id):
+    return enqueue_deletes([public_id])
+
+def chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def apply_deletes(public_ids, failed):
+    for chunk in chunked(public_ids, DELETE_BATCH_SIZE):
+        try:
+            deleted = storage.delete_resources(chunk).get('deleted', {})
+        except Exception as e:
+            failed.update(dict.fromkeys(chunk, str(e)))
+            continue
+        for public_id in chunk:
+            status = deleted.get(public_id)
+            # not_found only means the asset is already gone when the id has no vNNN segment
+            if status != 'deleted' and (status != 'not_found' or normalize_public_id(public_id) != public_id):
+                failed[public_id] = f"Cloudinary returned {status}"
+
+    removed = [public_id for public_id in public_ids if public_id not in failed]
+    if removed:
+        db.session.execute(delete(UploadedAsset.__table__).where(UploadedAsset.public_id.in_(removed)))
+
+def apply_tags(groups, failed):
+    for tags, public_ids in groups.items():
+        for chunk in chunked(public_ids, TAG_BATCH_SIZE):
+            try:
+                if tags:
+                    storage.replace_tag(list(tags), chunk)
+                else:
+                    storage.remove_all_tags(chunk)
+            except Exception as e:
+                failed.update(dict.fromkeys(chunk, str(e)))
+
+def drain_storage_outbox(limit=None):
+    config = current_app.config
+    limit = limit or config['STORAGE_OUTBOX_BATCH_SIZE']
+    now = datetime.datetime.utcnow()
+
+    rows = (
+        StorageOutbox.query
+        .filter(StorageOutbox.available_at <= now)
+        .order_by(StorageOutbox.id)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .all()
+    )
+    if not rows:
+        return {'selected': 0, 'applied': 0, 'failed': 0}
+
+    # Only the newest change per asset matters; older ones, including those waiting
+    # on a retry, would otherwise overwrite it when they run later.
+    latest = {}
+    for row in rows:
+        latest[row.public_id] = row
+    db.session.execute(delete(StorageOutbox.__table__).where(or_(*[
+        and_(StorageOutbox.public_id == public_id, StorageOutbox.id < row.id)
+        for public_id, row in latest.items()
+    ])))
+
+    deletes = [public_id for public_id, row in latest.items() if row.operation == OPERATION_DELETE]
+    tag_groups = {}
+    for public_id, row in latest.items():
+        if row.operation == OPERATION_TAGS:
+            tag_groups.setdefault(tuple(json.loads(row.tags or '[]')), []).append(public_id)
+
+    failed = {}
+    apply_deletes(deletes, failed)
+    apply_tags(tag_groups, failed)
+
+    applied = [row.id for public_id, row in latest.items() if public_id not in failed]
+    if applied:
+        db.session.execute(delete(StorageOutbox.__table__).where(StorageOutbox.id.in_(applied)))
+
+    for public_id, error in failed.items():
+        row = latest[public_id]
+        row.attempts += 1
+        row.last_error = error
+        if row.attempts >= config['STORAGE_OUTBOX_MAX_ATTEMPTS']:
+            row.available_at = None
+            current_app.logger.error(f"Giving up on Cloudinary {row.operation} for {public_id}: {error}")
+        else:
+            delay = config['STORAGE_OUTBOX_RETRY_DELAY'] * 2 ** (row.attempts - 1)
+            row.available_at = now + datetime.timedelta(seconds=delay)
+
+    db.session.commit()
+    return {'selected': len(rows), 'applied': len(applied), 'failed': len(failed)}
+
+def storage_outbox_backlog():
+    pending, dead = db.session.query(
+        func.count(StorageOutbox.available_at),
+        func.count(StorageOutbox.id) - func.count(StorageOutbox.available_at)
+    ).one()
+    return {'pending': pending, 'failed': dead}
+
+def run_storage_outbox_worker(once=False):
+    config = current_app.config
+    total = 0
+
+    while True:
+        try:
+            summary = drain_storage_outbox()
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            current_app.logger.error(f"Storage outbox drain failed, will retry: {str(e)}")
+            if once:
+                raise
+            time.sleep(config['STORAGE_OUTBOX_POLL_INTERVAL'])
+            continue
+
+        total += summary['applied']
+        if summary['selected']:
+            current_app.logger.info(f"Applied {summary['applied']} Cloudinary changes, {summary['failed']} failed")
+        if summary['selected'] < config['STORAGE_OUTBOX_BATCH_SIZE']:
+            if once:
+                return total
+            time.sleep(config['STORAGE_OUTBOX_POLL_INTERVAL'])
@@ -0,0 +1,105 @@
+# Compare Flask's default JSON provider with FastJSONProvider on realistic
+# response payloads. Run from the backend directory:
+#
+#     python -m benchmarks.bench_json_provider [--rounds N]
+
+import argparse
+import datetime
+import timeit
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from app.models.database import Page, Comment, Participant, Event
+from app.utils.json_provider import FastJSONProvider
+
+def build_participants(count=5000):
+    now = datetime.datetime.utcnow()
+    return [
+        Participant(
+            id=i,
+            name=f"Student {i}",
+            email=f"student{i}@example.edu",
+            phone="9876543210",
+            department="CSE",
+            academic_year=str(1 + i % 4),
+            college_code="QMC",
+            student_id=f"21A{i:05d}",
+            attended=i % 3 == 0,
+            event_id="quantum-computing-101-20250101",
+            created_at=now
+        ).to_dict()
+        for i in range(count)
+    ]
+
+def build_pages(count=200):
+    now = datetime.datetime.now().isoformat()
+    content = "<p>" + "Qubits, superposition and entanglement. " * 200 + "</p>"
+    return [
+        Page(
+            id=i,
+            title=f"Post {i}",
+            slug=f"post-{i}",
+            content=content,
+            is_blog=True,
+            excerpt=content[:150],
+            featured=i % 10 == 0,
+            created_at=now,
+            updated_at=now,
+            published_date=now,
+            comments_disabled=False
+        ).to_dict()
+        for i in range(count)
+    ]
+
+def build_comments(count=2000):
+    now = datetime.datetime.now()
+    return [
+        Comment(id=i, author_name=f"Reader {i}", content="Great write-up, thanks! " * 5, created_at=now).to_dict()
+        for i in range(count)
+    ]
+
+def build_events(count=100):
+    now = datetime.datetime.utcnow()
+    return [
+        Event(
+            id=f"event-{i}",
+            name=f"Event {i}",
+            description="Hands-on workshop",
+            event_date="2025-01-01",
+            accepting_submissions=True,
+            instructor="Dr. Q",
+            created_at=now,
+            updated_at=now
+        ).to_dict(participant_count=0, attended_count=0)
+        for i in range(count)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=20)
+    args = parser.parse_args()
+
+    payloads = {
+        'participants': build_participants(),
+        'pages': build_pages(),
+        'comments': build_comments(),
+        'events': build_events(),
+    }
+
+    app = Flask(__name__)
+    providers = {
+        'default': DefaultJSONProvider(app),
+        'fast': FastJSONProvider(app),
+    }
+
+    print(f"FastJSONProvider backend: {providers['fast'].backend}")
+    print(f"{'payload':<14}{'provider':<10}{'ms/op':>10}{'bytes':>12}")
+
+    with app.app_context():
+        for name, payload in payloads.items():
+            for provider_name, provider in providers.items():
+                elapsed = timeit.timeit(lambda: provider.response(payload), number=args.rounds)
+                size = len(provider.response(payload).get_data())
+                print(f"{name:<14}{provider_name:<10}{elapsed / args.rounds * 1000:>10.2f}{size:>12}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+import fakeredis
+import pytest
+from app import create_app
+from app.models.database import db
+from app.utils import redis_utils
+from app.utils.rate_limit import limiter
+
+@pytest.fixture
+def redis_client(monkeypatch):
+    client = fakeredis.FakeRedis()
+    monkeypatch.setattr(redis_utils, 'redis_client', client)
+    monkeypatch.setattr(redis_utils, 'cache_client', client)
+    return client
+
+@pytest.fixture
+def app(monkeypatch, redis_client):
+    monkeypatch.delenv('DATABASE_URL', raising=False)
+    app = create_app('testing')
+    limiter.enabled = False
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.drop_all()
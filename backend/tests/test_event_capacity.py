@@ -0,0 +1,58 @@
+import pytest
+from app.models.database import db, Event, Participant
+from app.utils.event_capacity import (
+    reserve_seat, release_seat, reset_seat_counter, seats_taken,
+    SEAT_FULL, SEAT_RESERVED, SEAT_HELD
+)
+from app.utils.registration_queue import pending_key
+
+EVENT_ID = 'capacity-event'
+
+def add_participant(student_id):
+    db.session.add(Participant(
+        name='Student', email=f"{student_id}@example.com", department='CSE', academic_year='2',
+        college_code='C1', student_id=student_id, event_id=EVENT_ID
+    ))
+    db.session.commit()
+
+@pytest.fixture
+def event(app):
+    db.session.add(Event(id=EVENT_ID, name='Workshop', event_date='2026-01-01', capacity=2))
+    db.session.commit()
+    return EVENT_ID
+
+def test_reserve_loads_existing_participants(event, redis_client):
+    add_participant('S1')
+
+    assert reserve_seat(event, 'S2', 2) == SEAT_RESERVED
+    assert reserve_seat(event, 'S3', 2) == SEAT_FULL
+    assert seats_taken(event) == 2
+
+def test_reserve_counts_queued_registrations(event, redis_client):
+    redis_client.hset(pending_key(event), 'S1', '{}')
+
+    assert reserve_seat(event, 'S1', 1) == SEAT_HELD
+    assert reserve_seat(event, 'S2', 1) == SEAT_FULL
+
+def test_holder_keeps_seat_when_event_is_full(event, redis_client):
+    assert reserve_seat(event, 'S1', 1) == SEAT_RESERVED
+    assert reserve_seat(event, 'S2', 1) == SEAT_FULL
+    assert reserve_seat(event, 'S1', 1) == SEAT_HELD
+
+def test_released_seat_can_be_taken(event, redis_client):
+    assert reserve_seat(event, 'S1', 1) == SEAT_RESERVED
+    release_seat(event, 'S1')
+
+    assert seats_taken(event) == 0
+    assert reserve_seat(event, 'S2', 1) == SEAT_RESERVED
+
+def test_reset_reloads_changed_student_ids(event, redis_client):
+    add_participant('S1')
+    assert reserve_seat(event, 'S1', 1) == SEAT_HELD
+
+    Participant.query.filter_by(student_id='S1').one().student_id = 'S9'
+    db.session.commit()
+    reset_seat_counter(event)
+
+    assert reserve_seat(event, 'S9', 1) == SEAT_HELD
+    assert reserve_seat(event, 'S1', 1) == SEAT_FULL
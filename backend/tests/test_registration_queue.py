@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy.exc import OperationalError
+from app.models.database import db, Event, Participant
+from app.utils import registration_queue
+from app.utils.registration_queue import (
+    enqueue_registration, get_registration_receipt, run_registration_worker, pending_key, CONSUMER_GROUP
+)
+
+EVENT_ID = 'surge-event'
+
+def registration(student_id, **fields):
+    return {
+        'name': 'Student', 'email': f"{student_id}@example.com", 'phone': '', 'department': 'CSE',
+        'academic_year': '2', 'college_code': 'C1', 'student_id': student_id, 'event_id': EVENT_ID, **fields
+    }
+
+def stream_backlog(app, redis_client):
+    stream_key = app.config['REGISTRATION_STREAM_KEY']
+    return redis_client.xlen(stream_key), redis_client.xpending(stream_key, CONSUMER_GROUP)['pending']
+
+@pytest.fixture
+def event(app):
+    db.session.add(Event(id=EVENT_ID, name='Hackathon', event_date='2026-01-01', surge_mode=True))
+    db.session.commit()
+    return EVENT_ID
+
+def test_worker_coalesces_repeat_registrations(app, event, redis_client):
+    first = enqueue_registration(registration('S1', name='Old Name'))
+    second = enqueue_registration(registration('S1', name='New Name'))
+    other = enqueue_registration(registration('S2'))
+
+    assert run_registration_worker(once=True, consumer='test') == 2
+
+    participants = {p.student_id: p.name for p in Participant.query.filter_by(event_id=event)}
+    assert participants == {'S1': 'New Name', 'S2': 'Student'}
+    for receipt_id in (first, second, other):
+        assert get_registration_receipt(receipt_id)['status'] == 'persisted'
+    assert redis_client.hlen(pending_key(event)) == 0
+    assert stream_backlog(app, redis_client) == (0, 0)
+
+def test_newer_registration_survives_flush(app, event, redis_client, monkeypatch):
+    enqueue_registration(registration('S1', name='Old Name'))
+    flush_participant_batch = registration_queue.flush_participant_batch
+
+    resubmitted = []
+
+    def flush_while_resubmitted(batch, summary):
+        flush_participant_batch(batch, summary)
+        if not resubmitted:
+            resubmitted.append(enqueue_registration(registration('S1', name='New Name')))
+
+    monkeypatch.setattr(registration_queue, 'flush_participant_batch', flush_while_resubmitted)
+    run_registration_worker(once=True, consumer='test')
+
+    assert Participant.query.filter_by(student_id='S1').one().name == 'New Name'
+    assert get_registration_receipt(resubmitted[0])['status'] == 'persisted'
+    assert redis_client.hlen(pending_key(event)) == 0
+
+def test_failed_rows_get_failed_receipts(app, event, redis_client):
+    bad = enqueue_registration(registration('S1', name=None))
+    good = enqueue_registration(registration('S2'))
+
+    assert run_registration_worker(once=True, consumer='test') == 1
+
+    assert get_registration_receipt(bad)['status'] == 'failed'
+    assert get_registration_receipt(good)['status'] == 'persisted'
+    assert stream_backlog(app, redis_client) == (0, 0)
+
+def test_entries_stay_pending_until_flush_succeeds(app, event, redis_client, monkeypatch):
+    receipt_id = enqueue_registration(registration('S1'))
+
+    def fail(batch, summary):
+        raise OperationalError('INSERT', {}, Exception('database is down'))
+
+    with monkeypatch.context() as patch:
+        patch.setattr(registration_queue, 'flush_participant_batch', fail)
+        with pytest.raises(OperationalError):
+            run_registration_worker(once=True, consumer='test')
+
+    assert stream_backlog(app, redis_client) == (1, 1)
+    assert get_registration_receipt(receipt_id)['status'] == 'queued'
+
+    assert run_registration_worker(once=True, consumer='test') == 1
+    assert get_registration_receipt(receipt_id)['status'] == 'persisted'
+    assert stream_backlog(app, redis_client) == (0, 0)
@@ -0,0 +1,110 @@
+import datetime
+import pytest
+from app.models.database import db, StorageOutbox, UploadedAsset
+from app.utils.storage import storage
+from app.utils.storage_outbox import (
+    enqueue_deletes, enqueue_metadata_updates, drain_storage_outbox, storage_outbox_backlog
+)
+
+class FakeCloudinary:
+    def __init__(self):
+        self.calls = []
+        self.failures = 0
+        self.delete_status = 'deleted'
+
+    def _record(self, call):
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError('Cloudinary is unavailable')
+        self.calls.append(call)
+
+    def delete_resources(self, public_ids):
+        self._record(('delete', tuple(public_ids)))
+        return {'deleted': dict.fromkeys(public_ids, self.delete_status)}
+
+    def replace_tag(self, tags, public_ids):
+        self._record(('tags', tuple(tags), tuple(public_ids)))
+
+    def remove_all_tags(self, public_ids):
+        self._record(('tags', (), tuple(public_ids)))
+
+@pytest.fixture
+def cloudinary(app, monkeypatch):
+    fake = FakeCloudinary()
+    monkeypatch.setattr(storage, 'enabled', True)
+    for name in ('delete_resources', 'replace_tag', 'remove_all_tags'):
+        monkeypatch.setattr(storage, name, getattr(fake, name))
+    return fake
+
+def make_due():
+    StorageOutbox.query.update({StorageOutbox.available_at: datetime.datetime.utcnow()})
+    db.session.commit()
+
+def test_only_latest_change_per_asset_is_applied(cloudinary):
+    enqueue_metadata_updates(['blog_uploads/a'], {'featured': True})
+    enqueue_metadata_updates(['blog_uploads/a', 'blog_uploads/b'], {'featured': False, 'category': 'events'})
+    enqueue_metadata_updates(['blog_uploads/c'], {'featured': True})
+    enqueue_deletes(['blog_uploads/c'])
+    db.session.commit()
+
+    assert drain_storage_outbox() == {'selected': 5, 'applied': 3, 'failed': 0}
+    assert sorted(cloudinary.calls) == [
+        ('delete', ('blog_uploads/c',)),
+        ('tags', ('category_events',), ('blog_uploads/a', 'blog_uploads/b')),
+    ]
+    assert StorageOutbox.query.count() == 0
+
+def test_deletes_remove_registry_rows(cloudinary):
+    db.session.add(UploadedAsset(public_id='blog_uploads/a', filename='a.png', url='https://example.com/a.png'))
+    enqueue_deletes(['v1712345678/blog_uploads/a', 'blog_uploads/gone'])
+    db.session.commit()
+    cloudinary.delete_status = 'not_found'
+
+    assert drain_storage_outbox()['applied'] == 2
+    assert UploadedAsset.query.count() == 0
+
+def test_failed_changes_back_off_and_retry(app, cloudinary):
+    enqueue_metadata_updates(['blog_uploads/a'], {'featured': True})
+    db.session.commit()
+    cloudinary.failures = 1
+
+    assert drain_storage_outbox() == {'selected': 1, 'applied': 0, 'failed': 1}
+    row = StorageOutbox.query.one()
+    assert row.attempts == 1
+    assert row.last_error == 'Cloudinary is unavailable'
+    assert row.available_at > datetime.datetime.utcnow() + datetime.timedelta(
+        seconds=app.config['STORAGE_OUTBOX_RETRY_DELAY'] - 5
+    )
+    assert drain_storage_outbox()['selected'] == 0
+
+    make_due()
+    assert drain_storage_outbox() == {'selected': 1, 'applied': 1, 'failed': 0}
+    assert cloudinary.calls == [('tags', ('featured',), ('blog_uploads/a',))]
+
+def test_new_change_supersedes_one_waiting_on_retry(cloudinary):
+    enqueue_metadata_updates(['blog_uploads/a'], {'featured': True})
+    db.session.commit()
+    cloudinary.failures = 1
+    drain_storage_outbox()
+
+    enqueue_deletes(['blog_uploads/a'])
+    db.session.commit()
+
+    assert drain_storage_outbox() == {'selected': 1, 'applied': 1, 'failed': 0}
+    assert cloudinary.calls == [('delete', ('blog_uploads/a',))]
+    assert StorageOutbox.query.count() == 0
+
+def test_gives_up_after_max_attempts(app, cloudinary):
+    app.config['STORAGE_OUTBOX_MAX_ATTEMPTS'] = 2
+    enqueue_deletes(['blog_uploads/a'])
+    db.session.commit()
+    cloudinary.failures = 2
+
+    drain_storage_outbox()
+    make_due()
+    drain_storage_outbox()
+
+    row = StorageOutbox.query.one()
+    assert row.attempts == 2
+    assert row.available_at is None
+    assert storage_outbox_backlog() == {'pending': 0, 'failed': 1}